@@ -9,62 +9,255 @@
 
 """Main file for the transshipment solver project"""
 
-from ag41_transshipment.parser import Parser
-from ag41_transshipment.solver import initialize, solve, print_solution, test_feasibility
+from ag41_transshipment.checkpoint import CHECKPOINT_INTERVAL, Checkpoint, load_checkpoint
+from ag41_transshipment.deadline import clear_deadline, get_time_left, set_deadline
+from ag41_transshipment.decomposition import solve_components
+from ag41_transshipment.lazy import unfold_chains
+from ag41_transshipment.metrics import record_cost, reset_metrics, timer
+from ag41_transshipment.output import QUIET, display, print_bound, print_execution_time, print_initial_solution, \
+    set_verbosity
+from ag41_transshipment.parser import SUMMARY_FIELDS, Parser, import_solution
+from ag41_transshipment.presolve import presolve_instance
+from ag41_transshipment.result_cache import relocate_solution
+from ag41_transshipment.solver import get_gap, get_solution_flows, initialize, test_feasibility
+import inspect
+import multiprocessing
+import os
 import sys
 import time
 
+# options of Application with which the result of a resolution doesn't only depend on the problem and the
+# configuration of the solver, or which measure the resolution itself
+UNCACHED_OPTIONS = ['warm_start', 'checkpoint', 'resume', 'metrics', 'profile']
+
 
 class Application(object):
     """Application class"""
 
-    def __init__(self, file_name, max_time):
+    def __init__(self, file_name, max_time, method='negative_cycle', initial_flow='dinic', workers=1, cache=False,
+                 solution_format='text', metrics=False, profile=False, lower_bound=False, target_gap=None,
+                 warm_start=None, checkpoint=None, resume=False, presolve=False, lazy=False):
+        """Solves the problem in a file and exports its solution
+
+        The options are described in the help of run.py. max_time is a deadline from the parsing of the file, only the
+        parsing, the expansion, the unfolding of the lazy chains and the export end past it."""
 
-        self.parser = Parser(file_name)
+        self.metrics = reset_metrics(profile)
+        deadline = set_deadline(max_time)
+        self.parser = Parser(file_name, cache)
+        self.init_cost = None
+        self.cost = None
+        self.lower_bound = None
+        self.gap = None
 
-        self.graph = self.parser.import_from_file()
-        # debug_graph(self.graph)
+        with timer('parse'):
+            instance = self.parser.import_instance()
+        if presolve:
+            with timer('presolve'):
+                instance, reductions = presolve_instance(instance)
+            display('Presolve: {} unreachable and {} dominated edges removed, {} capacities tightened'.format(
+                reductions['unreachable_edges'], reductions['dominated_edges'], reductions['tightened_edges']))
+        # debug_graph(instance.to_graph())
 
         u_time = time.time()
-        s_time = time.clock()
+        s_time = time.process_time()
+
+        warm_flows = None
+        elapsed = 0.
+        search_state = None
+        if resume:
+            state = load_checkpoint(self.parser.get_checkpoint_path(), self.parser.content_hash)
+            if state is None:
+                display('No checkpoint of the problem, starting from scratch')
+            else:
+                warm_start = None
+                warm_flows = state['flows']
+                elapsed = state['elapsed']
+                search_state = state['state']
+                max_time = max(max_time - elapsed * 1000, 0)
+                set_deadline(max_time, deadline.start)
+                display('Resuming from the checkpoint of cost {} after {:.3f} seconds'.format(state['cost'], elapsed))
 
-        self.graph = initialize(self.graph)
-        self.init_graph = self.graph.copy()
-        if test_feasibility(self.graph):
+        self.checkpoint = None
+        if checkpoint or resume:
+            interval = CHECKPOINT_INTERVAL if checkpoint is None or checkpoint is True else checkpoint
+            self.checkpoint = Checkpoint(self.parser.get_checkpoint_path(), self.parser.content_hash, interval,
+                                         elapsed, deadline.start, search_state)
 
-            print('\n#####################')
-            print('# Initial solution! #')
-            print('#####################')
-            print_solution(self.init_graph)
+        if warm_start is True:
+            warm_start = self.parser.get_solution_path(solution_format)
+        if isinstance(warm_start, str):
+            warm_flows = import_solution(warm_start)
+        elif warm_start is not None:
+            warm_flows = get_solution_flows(warm_start)
+
+        self.network = initialize(instance, initial_flow, lower_bound or target_gap is not None, warm_flows, lazy)
+        if lazy:
+            with timer('unfold'):
+                self.init_network = unfold_chains(self.network)
+        else:
+            self.init_network = self.network.copy()
+        if warm_flows is not None and not self.network.attributes['warm_start']:
+            display('The previous solution can\'t be repaired, starting from {}'.format(initial_flow))
+        if test_feasibility(self.network):
 
-            self.graph = solve(self.graph, max_time)
+            self.init_cost = self.init_network.get_cost()
+            self.lower_bound = self.network.attributes.get('lower_bound')
+            record_cost(self.init_cost)
+            print_initial_solution(self.init_network, self.init_cost)
+            if self.lower_bound is not None:
+                print_bound(self.init_cost, self.lower_bound, get_gap(self.init_cost, self.lower_bound))
+
+            self.network = solve_components(self.network, get_time_left(), workers, method, target_gap,
+                                            self.checkpoint)
+            if lazy:
+                with timer('unfold'):
+                    self.network = unfold_chains(self.network)
 
             u_time = time.time() - u_time
-            s_time = time.clock() - s_time
+            s_time = time.process_time() - s_time
+
+            self.cost = self.network.get_cost()
+            if self.lower_bound is not None:
+                self.gap = get_gap(self.cost, self.lower_bound)
+                print_bound(self.cost, self.lower_bound, self.gap)
+            self.u_time = u_time
+            self.s_time = s_time
 
-            self.parser.export_to_file(self.init_graph, self.graph, u_time, s_time)
+            with timer('export'):
+                self.parser.export_to_file(self.init_network, self.network, u_time, s_time, solution_format)
+            print_execution_time(u_time, s_time)
 
-            u_hour = (u_time - (u_time % 3600.)) / 3600
-            s_hour = (s_time - (s_time % 3600.)) / 3600
+        else:
+            self.u_time = time.time() - u_time
+            self.s_time = time.process_time() - s_time
 
-            u_time -= u_hour * 3600.
-            s_time -= s_hour * 3600.
+            if self.network.attributes['interrupted']:
+                display('No solution found within the time limit!')
+            else:
+                display('The problem can\'t be solved!')
+            with timer('export'):
+                self.parser.export_to_file(self.init_network, self.network, u_time, s_time, solution_format)
 
-            u_min = (u_time - (u_time % 60.)) / 60
-            s_min = (s_time - (s_time % 60.)) / 60
+        clear_deadline()
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
 
-            u_time -= u_min * 60.
-            s_time -= s_min * 60.
+        if metrics or profile:
+            self.metrics.export(self.parser.file_path + '.sol.metrics.json')
 
-            print('\nExecution time:')
-            print('\tUser time : {} hours, {} minutes and {} seconds'.format(u_hour, u_min, u_time))
-            print('\tSystem time : {} hours, {} minutes and {} seconds\n'.format(s_hour, s_min, s_time))
+        # debug_graph(self.network.to_graph())
 
-        else:
-            print('The problem can\'t be solved!')
-            self.parser.export_to_file(self.init_graph, self.graph, u_time, s_time)
+    def get_summary(self):
+        """Returns the main results of the resolution"""
+
+        return {
+            'instance': os.path.basename(self.parser.file_path),
+            'feasible': self.network.attributes['feasible'],
+            'initial_cost': self.init_cost,
+            'best_cost': self.cost,
+            'lower_bound': self.lower_bound,
+            'gap': self.gap,
+            'interrupted': self.network.attributes['interrupted'],
+            'user_time': self.u_time,
+            'system_time': self.s_time
+        }
+
+
+def solve_file(file_name, max_time, method='negative_cycle', initial_flow='dinic', result_cache=None, force=False,
+               **options):
+    """Solves the problem in a file and returns the summary of its resolution (with its wall time)
+
+    options are the keyword arguments of Application. With a result_cache (see ResultCache), a problem already
+    solved with the same configuration is read from it, unless force."""
+
+    start = time.time()
+    key = None
+    if result_cache is not None and not any(options.get(name) for name in UNCACHED_OPTIONS):
+        parser = Parser(file_name)
+        key = result_cache.get_key(parser.get_content_hash(),
+                                   get_configuration(max_time, method, initial_flow, options))
+
+        entry = None if force else result_cache.load(key)
+        if entry is not None:
+            with open(parser.get_solution_path(options.get('solution_format', 'text')), 'w') as file:
+                file.write(relocate_solution(entry['solution'], entry['problem'], file_name))
+            summary = entry['summary']
+            summary['instance'] = os.path.basename(file_name)
+            summary['cached'] = True
+            summary['wall_time'] = time.time() - start
+            display('{}: {} from the result cache'.format(file_name, summary['best_cost']))
+            return summary
+
+    app = Application(file_name, max_time, method, initial_flow, **options)
+    summary = app.get_summary()
+    summary['cached'] = False
+    if key is not None and not app.network.attributes.get('cancelled'):
+        with open(app.parser.get_solution_path(options.get('solution_format', 'text')), 'r') as file:
+            result_cache.store(key, {'problem': file_name, 'summary': summary, 'solution': file.read()})
+    summary['wall_time'] = time.time() - start
+
+    return summary
+
+
+def get_configuration(max_time, method, initial_flow, options):
+    """Returns the configuration of a resolution: its arguments and all options of Application, given or not"""
+
+    configuration = dict((name, parameter.default)
+                         for name, parameter in inspect.signature(Application).parameters.items()
+                         if parameter.default is not parameter.empty)
+    configuration.update(options)
+    configuration.update(max_time=max_time, method=method, initial_flow=initial_flow)
+    # the binary cache of the problem file doesn't change the result
+    del configuration['cache']
+
+    return configuration
+
+
+def solve_all(file_names, max_time, method='negative_cycle', initial_flow='dinic', workers=1, **options):
+    """Solves the problems in several files and returns the summaries of their resolutions
+
+    With more than one worker, the problems are spread across a pool of processes. options are given to
+    solve_file. A problem failing with an error doesn't stop the others, its summary gives the error."""
+
+    tasks = [(file_name, max_time, method, initial_flow, options) for file_name in file_names]
+
+    if workers <= 1:
+        return [solve_task(task) for task in tasks]
+
+    summaries = []
+    with multiprocessing.Pool(workers, initializer=silence_output) as pool:
+        for summary in pool.imap_unordered(solve_task, tasks):
+            if summary.get('error') is not None:
+                display('{}: {}'.format(summary['instance'], summary['error']), file=sys.stderr)
+            else:
+                display('{}: {} (initial: {}, interrupted: {}, cached: {}, {:.3f} seconds)'.format(
+                    summary['instance'], summary['best_cost'], summary['initial_cost'], summary['interrupted'],
+                    summary['cached'], summary['wall_time']))
+            summaries.append(summary)
+
+    summaries.sort(key=lambda summary: summary['instance'])
+    return summaries
+
+
+def solve_task(task):
+    """Solves the problem of a solve_all task (in a worker process), returns the error in its summary if any"""
+
+    file_name, max_time, method, initial_flow, options = task
+    try:
+        return solve_file(file_name, max_time, method, initial_flow, **options)
+    except Exception as error:
+        summary = dict((field, None) for field in SUMMARY_FIELDS)
+        summary['instance'] = os.path.basename(file_name)
+        summary['error'] = '{}: {}'.format(type(error).__name__, error)
+        display('{}: {}'.format(file_name, summary['error']), file=sys.stderr)
+        return summary
+
+
+def silence_output():
+    """Disables the console output of a worker process"""
 
-        # debug_graph(self.graph)
+    set_verbosity(QUIET)
 
 
 def debug_graph(graph):
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: benchmark.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Scaling benchmark of the transshipment solver project"""
+
+from ag41_transshipment.app import Application, silence_output
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.network import EPSILON
+from ag41_transshipment.output import display
+from ag41_transshipment.parser import export_instance
+import multiprocessing
+import os
+import resource
+import time
+
+# sizes of the generated instances: (depots, platforms, clients)
+SIZE_LADDER = [(2, 5, 20), (3, 10, 50), (5, 20, 100), (8, 40, 200), (10, 80, 400)]
+
+BENCHMARK_FIELDS = ['instance', 'depots', 'platforms', 'clients', 'nbr_nodes', 'nbr_edges', 'feasible',
+                    'time_to_first_feasible', 'time_to_best', 'initial_cost', 'best_cost', 'lower_bound', 'gap',
+                    'interrupted', 'user_time', 'system_time', 'wall_time', 'peak_memory']
+
+
+def run_benchmark(directory, max_time, method='negative_cycle', initial_flow='dinic', sizes=None, seed=0,
+                  **options):
+    """Solves a generated instance of each size of a ladder and returns the results of each run
+
+    The instances are written in directory. Each run has its own fresh process, for its peak memory (in megabytes).
+    Times are in seconds from the start of the run. options are given to generate_instance."""
+
+    results = []
+    for depots, platforms, clients in sizes if sizes is not None else SIZE_LADDER:
+        instance = generate_instance(depots, platforms, clients, seed, **options)
+        file_name = os.path.join(directory, instance.attributes['name'] + '.txt')
+        export_instance(instance, file_name)
+
+        # a new process for each run, the peak memory of a process never decreases, started without the memory
+        # of this one (a forked process would start with it)
+        with multiprocessing.get_context('spawn').Pool(1, initializer=silence_output) as pool:
+            result = pool.apply(run_instance, (file_name, max_time, method, initial_flow))
+        result.update({
+            'depots': depots,
+            'platforms': platforms,
+            'clients': clients,
+            'nbr_nodes': len(instance.node_ids),
+            'nbr_edges': len(instance.edge_ids)
+        })
+
+        display('{}: {} (initial: {} after {}, best after {}, {:.3f} seconds, {:.1f} MB)'.format(
+            result['instance'], result['best_cost'], result['initial_cost'],
+            format_time(result['time_to_first_feasible']), format_time(result['time_to_best']), result['wall_time'],
+            result['peak_memory']))
+        results.append(result)
+
+    return results
+
+
+def run_instance(file_name, max_time, method, initial_flow):
+    """Solves the problem in a file and returns the results of the run (in a benchmark process)"""
+
+    start = time.time()
+    app = Application(file_name, max_time, method, initial_flow)
+    result = app.get_summary()
+    result['wall_time'] = time.time() - start
+
+    trajectory = app.metrics.trajectory
+    result['time_to_first_feasible'] = trajectory[0][0] if trajectory else None
+    # the end of the resolution records the best cost again, the best one is the first reaching it
+    result['time_to_best'] = next(t for t, cost in trajectory if cost <= trajectory[-1][1] + EPSILON) \
+        if trajectory else None
+    # ru_maxrss is in kilobytes on Linux
+    result['peak_memory'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.
+
+    return result
+
+
+def format_time(seconds):
+    """Formats a time of a benchmark result, which is None if there is no solution"""
+
+    return '-' if seconds is None else '{:.3f}s'.format(seconds)
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: checkpoint.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Checkpoints of long resolutions for the transshipment solver project"""
+
+import json
+import numpy as np
+import os
+import threading
+import time
+
+# default time between two checkpoints, in seconds
+CHECKPOINT_INTERVAL = 60.
+
+
+class Checkpoint(object):
+    """Best solution of a resolution, saved in a file at regular intervals by a background thread
+
+    The time spent is counted from start, plus elapsed before a resumed run. state is the state of the
+    metaheuristic (random generator, slopes...), saved with the solution so a resumed search goes on."""
+
+    def __init__(self, file_path, content_hash, interval=CHECKPOINT_INTERVAL, elapsed=0., start=None, state=None):
+        """Creates the Checkpoint object"""
+
+        self.file_path = file_path
+        self.content_hash = content_hash
+        self.interval = interval
+        self.elapsed = elapsed
+        self.start_time = time.time() if start is None else start
+        self.network = None
+        self.get_best = None
+        self.state = dict() if state is None else state
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self, network, get_best):
+        """Starts saving the best solution of a search on a network"""
+
+        self.network = network
+        self.get_best = get_best
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Saves the best solution at each interval until stopped (in the background thread)"""
+
+        while not self.stopped.wait(self.interval):
+            self.save()
+
+    def stop(self):
+        """Stops the background thread and saves the best solution a last time"""
+
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+        self.save()
+
+    def save(self):
+        """Writes the best solution in the checkpoint file, replaced at once so it is never left half written"""
+
+        cost, flow = self.get_best()
+        used = np.flatnonzero(flow > 0)
+        labels = np.array([str(label) for label in self.network.labels])
+
+        # the arrays of the state are saved as such, the rest of it (random generator state...) in JSON
+        state = dict(self.state)
+        arrays = dict(('state_' + key, value) for key, value in state.items() if isinstance(value, np.ndarray))
+        state = dict((key, value) for key, value in state.items() if not isinstance(value, np.ndarray))
+
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            np.savez(file, content_hash=np.array(self.content_hash), cost=np.array(cost),
+                     elapsed=np.array(self.elapsed + time.time() - self.start_time),
+                     tail=labels[self.network.tail[used]], head=labels[self.network.head[used]], flow=flow[used],
+                     state=np.array(json.dumps(state)), **arrays)
+        os.replace(tmp_path, self.file_path)
+
+    def remove(self):
+        """Deletes the checkpoint file, once the solution is written"""
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+
+def load_checkpoint(file_path, content_hash):
+    """Reads a checkpoint file, returns None if there is none or if it was written for another problem
+
+    The checkpoint is returned as a dictionary with the cost, the time spent (elapsed), the flows of the
+    best solution (flows, as used by warm_start) and the state of the search (see Checkpoint)."""
+
+    try:
+        with np.load(file_path) as checkpoint:
+            if str(checkpoint['content_hash']) != content_hash:
+                return None
+            state = json.loads(str(checkpoint['state']))
+            state.update((key[len('state_'):], checkpoint[key]) for key in checkpoint.files if key.startswith('state_'))
+            return {
+                'cost': float(checkpoint['cost']),
+                'elapsed': float(checkpoint['elapsed']),
+                'flows': dict(zip(zip(checkpoint['tail'].tolist(), checkpoint['head'].tolist()),
+                                  checkpoint['flow'].tolist())),
+                'state': state
+            }
+    except (IOError, ValueError, KeyError):
+        return None
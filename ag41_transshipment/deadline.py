@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: deadline.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Deadline of the resolutions of the transshipment solver project
+
+Like the metrics, the deadline of the current resolution is kept in a module variable, so the algorithms only
+have to call check_deadline, however deep they are, to stop in time."""
+
+import contextlib
+import time
+
+
+class DeadlineReached(Exception):
+    """Raised to end a phase of the resolution when its time limit is reached (unlike a Ctrl-C)"""
+
+
+class Deadline(object):
+    """Wall-clock time at which a resolution must end"""
+
+    def __init__(self, max_time, start=None):
+        """Creates the Deadline object, max_time (in milliseconds) after start (by default, now)"""
+
+        self.start = time.time() if start is None else start
+        self.end = self.start + max_time / 1000
+
+    def get_time_left(self):
+        """Returns the time left before the deadline, in milliseconds"""
+
+        return max(self.end - time.time(), 0.) * 1000
+
+    def is_reached(self):
+        """Tells whether the deadline is reached"""
+
+        return time.time() >= self.end
+
+
+DEADLINE = None
+
+
+def set_deadline(max_time, start=None):
+    """Sets the deadline of the current resolution and returns it (see Deadline)"""
+
+    global DEADLINE
+    DEADLINE = Deadline(max_time, start)
+    return DEADLINE
+
+
+def clear_deadline():
+    """Removes the deadline of the current resolution"""
+
+    global DEADLINE
+    DEADLINE = None
+
+
+def get_time_left(max_time=float('infinity')):
+    """Returns the time left (in milliseconds) before the deadline of the current resolution, at most max_time"""
+
+    if DEADLINE is None:
+        return max_time
+    return min(max_time, DEADLINE.get_time_left())
+
+
+def check_deadline():
+    """Ends the current phase when the deadline of the current resolution is reached"""
+
+    if DEADLINE is not None and DEADLINE.is_reached():
+        raise DeadlineReached
+
+
+@contextlib.contextmanager
+def limit_time(max_time, start=None):
+    """Runs a with block with a deadline max_time (in milliseconds) after start, unless the current one is earlier"""
+
+    global DEADLINE
+    deadline = DEADLINE
+    new_deadline = Deadline(max_time, start)
+    if deadline is None or new_deadline.end < deadline.end:
+        DEADLINE = new_deadline
+    try:
+        yield
+    finally:
+        DEADLINE = deadline
+
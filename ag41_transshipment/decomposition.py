@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: decomposition.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Resolution of the independent parts of a network for the transshipment solver project"""
+
+from ag41_transshipment.deadline import DeadlineReached, get_time_left, limit_time
+from ag41_transshipment.metrics import count, get_metrics, record_cost, reset_metrics, timer
+from ag41_transshipment.output import QUIET, display, print_deadline, print_improvement, print_interruption, \
+    print_target_gap, set_verbosity
+from ag41_transshipment.portfolio import solve_portfolio
+from ag41_transshipment.residual import ResidualGraph
+from ag41_transshipment.solver import CYCLE_SEARCHES, METAHEURISTICS, TargetGapReached, check_gap, get_gap, solve
+import multiprocessing
+import time
+
+
+def solve_components(network, max_time, workers=1, method='negative_cycle', target_gap=None, checkpoint=None):
+    """Solves each weakly connected component of a network separately and merges their flows
+
+    The parts are solved in parallel with several workers, else one after the other with the time left shared by
+    their number of edges. A network which doesn't split, or with a checkpoint, is solved as a whole."""
+
+    u_time = time.time()
+    s_time = time.process_time()
+
+    # without time left, the network isn't split and solve ends at once
+    parts = []
+    if get_time_left(max_time) > 0:
+        with timer('components'):
+            components = [nodes for nodes in network.get_components() if (network.demand[nodes] > 0).any()]
+            if len(components) > 1 and checkpoint is None:
+                parts = [network.get_subnetwork(nodes) for nodes in components]
+
+    if len(parts) <= 1 or checkpoint is not None:
+        if workers > 1:
+            return solve_portfolio(network, max_time, workers, method, target_gap, checkpoint)
+        return solve(network, max_time, method, target_gap=target_gap, checkpoint=checkpoint)
+
+    display('The network splits into {} independent parts'.format(len(parts)))
+    count('components', len(parts))
+    total_edges = sum(len(edges) for part, edges in parts)
+    lower_bound = network.attributes.get('lower_bound')
+    cost = network.get_cost()
+    interrupted = False
+    cancelled = False
+
+    try:
+        with timer('cycle_search'):
+            if workers > 1:
+                processes = min(workers, len(parts))
+                tasks = [(part, max_time * min(1., processes * len(edges) / total_edges), method, target_gap,
+                          lower_bound, cost - part.get_cost()) for part, edges in parts]
+                with multiprocessing.Pool(processes, initializer=set_verbosity, initargs=(QUIET,)) as pool:
+                    results = pool.map(run_component, tasks)
+                for (part, edges), (flow, part_interrupted, counters) in zip(parts, results):
+                    network.flow[edges] = flow
+                    interrupted = interrupted or part_interrupted
+                    for counter, value in counters.items():
+                        count(counter, value)
+
+            else:
+                edges_left = total_edges
+                for part, edges in parts:
+                    time_left = max(max_time - (time.time() - u_time) * 1000, 0)
+                    flow, part_interrupted = solve_component(part, time_left * len(edges) / edges_left, method,
+                                                             target_gap, lower_bound, cost - part.get_cost())
+                    network.flow[edges] = flow
+                    cost = network.get_cost()
+                    interrupted = interrupted or part_interrupted
+                    edges_left -= len(edges)
+
+    except KeyboardInterrupt:
+        cancelled = True
+
+    cost = network.get_cost()
+    network.attributes['cost'] = cost
+    network.attributes['interrupted'] = interrupted or cancelled
+    network.attributes['cancelled'] = cancelled
+    network.attributes['gap_reached'] = not interrupted and not cancelled and target_gap is not None and \
+        lower_bound is not None and get_gap(cost, lower_bound) <= target_gap
+    record_cost(cost)
+
+    print_improvement(network, cost, u_time, s_time)
+    if cancelled:
+        print_interruption()
+    elif interrupted:
+        print_deadline()
+    elif network.attributes['gap_reached']:
+        print_target_gap()
+
+    return network
+
+
+def solve_component(network, max_time, method, target_gap=None, lower_bound=None, other_cost=0.):
+    """Solves the network of a part of a problem, returns the best flow found and whether it was interrupted
+
+    With a target_gap, the part ends once its cost plus other_cost, the cost of the rest of the problem, is
+    close enough to lower_bound, the lower bound of the whole problem."""
+
+    u_time = time.time()
+    residual = ResidualGraph(network)
+    best = [network.flow.copy()]
+
+    def report():
+        best[0] = network.flow.copy()
+        check_gap(residual.cost + other_cost, lower_bound, target_gap)
+
+    try:
+        with limit_time(max_time, u_time):
+            check_gap(residual.cost + other_cost, lower_bound, target_gap)
+            if method in METAHEURISTICS:
+                METAHEURISTICS[method](residual, u_time, max_time, report)
+            else:
+                improve = CYCLE_SEARCHES[method]
+                while improve(residual, u_time, max_time):
+                    report()
+
+    except TargetGapReached:
+        pass
+    except DeadlineReached:
+        return best[0], True
+
+    return best[0], False
+
+
+def run_component(task):
+    """Solves a part of a problem (in a worker process), its counters are sent back with its flow"""
+
+    network, max_time, method, target_gap, lower_bound, other_cost = task
+    reset_metrics()
+    flow, interrupted = solve_component(network, max_time, method, target_gap, lower_bound, other_cost)
+
+    return flow, interrupted, get_metrics().counters
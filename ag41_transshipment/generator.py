@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: generator.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Random instance generator for the transshipment solver project"""
+
+from ag41_transshipment.network import Instance
+import numpy as np
+
+# travel time and unit cost of an edge for a unit of distance (nodes lie in the unit square)
+TIME_PER_DISTANCE = 50.
+COST_PER_DISTANCE = 5.
+
+
+def generate_instance(depots, platforms, clients, seed=0, tightness=1.5, cost_ratio=10., time_limit=100.,
+                      density=0.7):
+    """Generates a random instance with the same seed always giving the same instance
+
+    A hidden flow meeting all demands in time is linked first, so the instance is feasible when tightness is at
+    least 1. Raises ValueError without a node of each kind, or with fewer units demanded than depots."""
+
+    if min(depots, platforms, clients) < 1:
+        raise ValueError('An instance needs at least one depot, one platform and one client')
+
+    rng = np.random.default_rng(seed)
+    nbr_nodes = depots + platforms + clients
+
+    client_demand = rng.integers(1, 21, clients)
+    total = int(client_demand.sum())
+    if total < depots:
+        raise ValueError('The clients demand {} units, fewer than the {} depots each supplying one'.format(total,
+                                                                                                        depots))
+    # every depot supplies at least one unit, so it stays a depot
+    depot_supply = 1 + rng.multinomial(total - depots, rng.dirichlet(np.ones(depots)))
+
+    # hidden flow: each client is served by one platform, which is supplied by the depots
+    client_platform = rng.integers(0, platforms, clients)
+    load = np.bincount(client_platform, weights=client_demand, minlength=platforms)
+    dp_flow = get_transport_flow(load, depot_supply).T
+    cp_flow = np.zeros((clients, platforms))
+    cp_flow[np.arange(clients), client_platform] = client_demand
+
+    dp_links = (rng.random((depots, platforms)) < density) | (dp_flow > 0)
+    cp_links = (rng.random((clients, platforms)) < density) | (cp_flow > 0)
+
+    # node ids: clients first, then platforms, then depots
+    node_ids = np.arange(1, nbr_nodes + 1)
+    x = rng.random(nbr_nodes)
+    y = rng.random(nbr_nodes)
+    demand = np.concatenate((client_demand, np.zeros(platforms, dtype=np.int64), -depot_supply))
+    node_unit_cost = np.concatenate((np.zeros(clients), rng.uniform(0., 3., platforms), np.zeros(depots)))
+    node_time = np.concatenate((np.zeros(clients), rng.uniform(0., 0.2 * time_limit, platforms), np.zeros(depots)))
+
+    depot, dp_platform = np.nonzero(dp_links)
+    client, cp_platform = np.nonzero(cp_links)
+    tail = np.concatenate((clients + platforms + depot, clients + cp_platform))
+    head = np.concatenate((clients + dp_platform, client))
+    flow = np.concatenate((dp_flow[depot, dp_platform], cp_flow[client, cp_platform]))
+
+    share = np.concatenate((depot_supply[depot] / dp_links.sum(axis=1)[depot],
+                            client_demand[client] / cp_links.sum(axis=1)[client]))
+    capacity = np.maximum(np.round(tightness * share * rng.uniform(0.5, 1.5, len(tail))), 1)
+    capacity = np.where(flow > 0, np.maximum(np.ceil(tightness * flow), 1), capacity).astype(np.int64)
+
+    distance = np.hypot(x[tail] - x[head], y[tail] - y[head])
+    edge_time = TIME_PER_DISTANCE * distance * rng.uniform(0.8, 1.2, len(tail))
+    # the chains of the hidden flow take at most 0.4 + 0.2 + 0.4 times the time limit
+    edge_time = np.where(flow > 0, np.minimum(edge_time, 0.4 * time_limit), edge_time)
+    unit_cost = COST_PER_DISTANCE * distance * rng.uniform(0.5, 1.5, len(tail))
+    fixed_cost = cost_ratio * unit_cost * capacity / 2 * rng.uniform(0.5, 1.5, len(tail))
+
+    attributes = {
+        'name': 'generated-{}-{}-{}-{}'.format(depots, platforms, clients, seed),
+        'nbr_nodes': nbr_nodes,
+        'nbr_edges': len(tail),
+        'time': time_limit
+    }
+
+    return Instance(attributes, node_ids, x, y, demand, node_unit_cost, node_time, np.arange(1, len(tail) + 1),
+                    node_ids[tail], node_ids[head], capacity, fixed_cost, unit_cost, edge_time)
+
+
+def get_transport_flow(supply, demand):
+    """Sends the supplies to the demands (of the same total) in order, as in the north-west corner rule
+
+    Returns the flow from each supply to each demand, as a matrix."""
+
+    supply_end = np.cumsum(supply)
+    demand_end = np.cumsum(demand)
+    bounds = np.union1d(np.concatenate(([0], supply_end)), demand_end)
+
+    # each interval between two bounds goes from one supply to one demand
+    middle = (bounds[:-1] + bounds[1:]) / 2
+    flow = np.zeros((len(supply), len(demand)))
+    np.add.at(flow, (np.searchsorted(supply_end, middle), np.searchsorted(demand_end, middle)), np.diff(bounds))
+
+    return flow
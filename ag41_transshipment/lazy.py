@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: lazy.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Lazy expansion of the chains of very large networks for the transshipment solver project"""
+
+from ag41_transshipment.network import Network
+import numpy as np
+
+
+def get_ladders(instance, tail, head, dp, cp):
+    """Builds a ladder for each platform, standing for all chains through it within the time limit
+
+    Returns the platform, rank and CP edge (index in cp) of each level, the DP edges entering the ladders (indices
+    in dp) with the level they enter, and the steps from a level to the one below it."""
+
+    time_limit = instance.attributes['time']
+    edge_time = instance.edge_time
+
+    # a DP edge and a CP edge of a platform form a chain if their times sum within the limit, so each DP edge
+    # enters the highest level it forms a chain with and reaches the CP edges of this level and those below
+
+    # levels: the CP edges of each platform by increasing time
+    level_cp = np.lexsort((edge_time[cp], tail[cp]))
+    level_platform = tail[cp][level_cp]
+    level_time = edge_time[cp][level_cp]
+    platforms, starts, counts = np.unique(level_platform, return_index=True, return_counts=True)
+    level_rank = np.arange(len(level_cp)) - np.repeat(starts, counts)
+
+    step = np.flatnonzero(level_rank > 0)
+    entry_dp = []
+    entry_level = []
+    dp_platform = head[dp]
+    for platform, start, end in zip(platforms.tolist(), starts.tolist(), (starts + counts).tolist()):
+        edges = np.flatnonzero(dp_platform == platform)
+        before = edge_time[dp[edges]] + instance.node_time[platform]
+        times = level_time[start:end]
+
+        # highest level of each DP edge, checked with the same sums as get_chains
+        level = np.searchsorted(times, time_limit - before, side='right') - 1
+        while True:
+            up = (level + 1 < len(times)) & (before + times[np.minimum(level + 1, len(times) - 1)] <= time_limit)
+            down = (level >= 0) & (before + times[np.maximum(level, 0)] > time_limit)
+            if not up.any() and not down.any():
+                break
+            level += up.astype(np.int64) - down.astype(np.int64)
+
+        entry_dp.append(edges[level >= 0])
+        entry_level.append(start + level[level >= 0])
+
+    entry_dp = np.concatenate(entry_dp) if entry_dp else np.zeros(0, dtype=np.int64)
+    entry_level = np.concatenate(entry_level) if entry_level else np.zeros(0, dtype=np.int64)
+
+    return level_platform, level_rank, level_cp, entry_dp, entry_level, step
+
+
+def get_ladder_nodes(network):
+    """Tells which nodes of a network expanded lazily are levels of a ladder, labelled L[platform]-[rank]"""
+
+    return np.array([isinstance(label, str) and label.startswith('L') for label in network.labels], dtype=bool)
+
+
+def run_with_shortcuts(network, algorithm):
+    """Runs a flow algorithm on a network expanded lazily, with shortcuts down its ladders
+
+    The level of rank r also leads to the level of rank r - 2^i for each 2^i dividing r, so the Dinic phases don't
+    grow with the length of the ladders. The flow of each shortcut then goes down the steps it skips."""
+
+    is_ladder = get_ladder_nodes(network)
+    if not is_ladder.any():
+        return algorithm(network)
+
+    rank = np.zeros(network.nbr_nodes, dtype=np.int64)
+    rank[is_ladder] = [int(label.split('-')[1]) - 1 for label, ladder in zip(network.labels, is_ladder) if ladder]
+    step = np.flatnonzero(is_ladder[network.tail] & is_ladder[network.head])
+    step_capacity = np.zeros(network.nbr_nodes, dtype=np.int64)
+    step_capacity[network.tail[step]] = network.capacity[step]
+
+    # the levels of a ladder are consecutive nodes from its lowest rank (see expand_ladders)
+    tail = [network.tail]
+    head = [network.head]
+    capacity = [network.capacity]
+    size = 2
+    while (rank >= size).any():
+        start = np.flatnonzero(is_ladder & (rank >= size) & (rank % size == 0))
+        tail.append(start)
+        head.append(start - size)
+        capacity.append(step_capacity[start])
+        size *= 2
+
+    tail = np.concatenate(tail)
+    head = np.concatenate(head)
+    no_cost = np.zeros(len(tail) - network.nbr_edges)
+    shortcuts = Network(network.labels, network.demand, tail, head, range(len(tail)), np.concatenate(capacity),
+                        np.concatenate((network.fixed_cost, no_cost)), np.concatenate((network.unit_cost, no_cost)))
+    algorithm(shortcuts)
+
+    # the step from level s to level s - 1 carries the flow of the shortcuts from t >= s to h < s, as the
+    # shortcuts stay in their ladder, the sums over the other ladders are 0
+    flow = shortcuts.flow[network.nbr_edges:]
+    skipped = (np.bincount(tail[network.nbr_edges:], flow, network.nbr_nodes)
+               - np.bincount(head[network.nbr_edges:], flow, network.nbr_nodes))
+    skipped = np.cumsum(skipped[::-1])[::-1].round().astype(np.int64)
+    network.flow[:] = shortcuts.flow[:network.nbr_edges]
+    network.flow[step] += skipped[network.tail[step]]
+
+    return network
+
+
+def unfold_chains(network):
+    """Replaces the ladders of a network expanded lazily by the chains their flow goes through
+
+    Returns a new network with an edge from a DP node to a CP node for each chain carrying flow."""
+
+    labels = network.labels
+    is_ladder = get_ladder_nodes(network)
+    kept = np.flatnonzero(~(is_ladder[network.tail] | is_ladder[network.head]))
+    used = network.flow > 0
+    entries = np.flatnonzero(used & ~is_ladder[network.tail] & is_ladder[network.head])
+    leaves = np.flatnonzero(used & is_ladder[network.tail] & ~is_ladder[network.head])
+
+    # the levels of a ladder are consecutive nodes from its lowest rank (see expand_ladders), so by decreasing
+    # node both edges come ladder by ladder, from the highest level. As the flows are conserved, the first x
+    # units leaving a ladder down to a level can't exceed the first x units entering it down to this level.
+    entries = entries[np.argsort(-network.head[entries], kind='stable')]
+    leaves = leaves[np.argsort(-network.tail[leaves], kind='stable')]
+    entered = np.cumsum(network.flow[entries])
+    left = np.cumsum(network.flow[leaves])
+    bounds = np.union1d(entered, left)
+    starts = np.concatenate(([0], bounds))[:-1]
+    entry = entries[np.searchsorted(entered, starts, side='right')]
+    leave = leaves[np.searchsorted(left, starts, side='right')]
+
+    # pieces of the same chain are summed, a DP node enters a single level
+    pairs, first, inverse = np.unique(network.tail[entry] * network.nbr_nodes + network.head[leave],
+                                      return_index=True, return_inverse=True)
+    entry = entry[first]
+    leave = leave[first]
+    chain_flow = np.bincount(inverse, bounds - starts, len(pairs)).astype(np.int64)
+
+    nodes = np.flatnonzero(~is_ladder)
+    new_index = np.full(len(labels), -1, dtype=np.int64)
+    new_index[nodes] = np.arange(len(nodes))
+
+    # chain ids join the depot, platform and client of the chain, as in a graph expanded with all chains
+    # (the labels of parallel edges end with their edge id, see get_edge_node_labels)
+    chain_ids = ['{}-{}'.format('-'.join(labels[u][2:].split('-')[:2]), labels[v][2:].split('-')[0])
+                 for u, v in zip(network.tail[entry].tolist(), network.head[leave].tolist())]
+    unfolded = Network([labels[i] for i in nodes.tolist()], network.demand[nodes],
+                       np.concatenate((new_index[network.tail[kept]], new_index[network.tail[entry]])),
+                       np.concatenate((new_index[network.head[kept]], new_index[network.head[leave]])),
+                       [network.edge_ids[e] for e in kept.tolist()] + chain_ids,
+                       np.concatenate((network.capacity[kept],
+                                       np.minimum(network.capacity[entry], network.capacity[leave]))),
+                       np.concatenate((network.fixed_cost[kept], np.zeros(len(pairs)))),
+                       np.concatenate((network.unit_cost[kept], network.unit_cost[entry])),
+                       network.attributes)
+    unfolded.flow[:] = np.concatenate((network.flow[kept], chain_flow))
+
+    return unfolded
+
+
+def fold_chains(network, flows):
+    """Sends the flows of the chains of a previous solution through the ladders of a network expanded lazily
+
+    flows give the flow of each edge by the labels of its nodes (see warm_start), the chains that can't be followed
+    in the ladders any more are left out."""
+
+    labels = [str(label) for label in network.labels]
+    is_ladder = np.array([label.startswith('L') for label in labels], dtype=bool)
+    if not is_ladder.any():
+        return
+
+    # edge entering the ladder from each DP node, to the level below from each level, and to each CP node
+    entry = dict()
+    down = dict()
+    leave = dict()
+    for e, (u, v) in enumerate(zip(network.tail.tolist(), network.head.tolist())):
+        if is_ladder[u] and is_ladder[v]:
+            down[u] = e
+        elif is_ladder[v]:
+            entry[u] = e
+        elif is_ladder[u]:
+            leave[v] = e
+
+    index = dict((label, i) for i, label in enumerate(labels))
+    for (u_label, v_label), flow in flows.items():
+        u = index.get(u_label)
+        v = index.get(v_label)
+        if u not in entry or v not in leave:
+            continue
+
+        path = [entry[u]]
+        level = network.head[entry[u]]
+        while level != network.tail[leave[v]] and level in down:
+            path.append(down[level])
+            level = network.head[down[level]]
+        if level == network.tail[leave[v]]:
+            path.append(leave[v])
+            network.flow[path] += flow
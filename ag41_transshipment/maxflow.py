@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: maxflow.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Maximum flow algorithms for the transshipment solver project
+
+All algorithms send as much flow as possible from the depots to the clients of a network and store it
+in network.flow. In the flow network, arc 2e goes along edge e and arc 2e + 1 goes backward."""
+
+from ag41_transshipment.deadline import check_deadline
+from ag41_transshipment.metrics import count
+from collections import deque
+import numpy as np
+
+
+def dinic(network):
+    """Computes a maximum flow from the depots to the clients of a network (Dinic Algorithm)"""
+
+    source, target, tail, head, capacity, succ = get_flow_network(network)
+    flow = [0] * len(tail)
+
+    while push_blocking_flow(source, target, tail, head, capacity, flow, succ):
+        pass
+
+    network.flow[:] = flow[:network.nbr_edges]
+
+    return network
+
+
+def push_blocking_flow(source, target, tail, head, capacity, flow, succ, admissible=None):
+    """Pushes a blocking flow in the level graph of the flow network (one phase of the Dinic Algorithm)
+
+    Only arcs whose admissible value is true are used, all of them if admissible is None. Returns False if the
+    target can't be reached from the source. The deadline is checked after each augmenting path."""
+
+    check_deadline()
+
+    # run a breadth first traversal to build the level graph
+    level = [-1] * len(succ)
+    level[source] = 0
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for arc in succ[u]:
+            e = arc >> 1
+            if arc & 1:
+                v = tail[e]
+                gap = flow[e]
+            else:
+                v = head[e]
+                gap = capacity[e] - flow[e]
+            if gap > 0 and level[v] < 0 and (admissible is None or admissible[arc]):
+                level[v] = level[u] + 1
+                queue.append(v)
+
+    # if there is no path from the source to the target
+    if level[target] < 0:
+        return False
+
+    # push flow with depth first searches, each node remembering its next arc to try
+    current = [0] * len(succ)
+    path = []
+    u = source
+    while True:
+        if u == target:
+            df = min(flow[arc >> 1] if arc & 1 else capacity[arc >> 1] - flow[arc >> 1] for arc in path)
+            for arc in path:
+                if arc & 1:
+                    flow[arc >> 1] -= df
+                else:
+                    flow[arc >> 1] += df
+            count('augmenting_paths')
+            check_deadline()
+            path = []
+            u = source
+            continue
+
+        arcs = succ[u]
+        while current[u] < len(arcs):
+            arc = arcs[current[u]]
+            e = arc >> 1
+            if arc & 1:
+                v = tail[e]
+                gap = flow[e]
+            else:
+                v = head[e]
+                gap = capacity[e] - flow[e]
+            if gap > 0 and level[v] == level[u] + 1 and (admissible is None or admissible[arc]):
+                break
+            current[u] += 1
+        else:
+            # dead end: go back to the previous node and skip the arc leading here
+            if u == source:
+                break
+            arc = path.pop()
+            u = head[arc >> 1] if arc & 1 else tail[arc >> 1]
+            current[u] += 1
+            continue
+
+        path.append(arc)
+        u = v
+
+    return True
+
+
+def edmonds_karp(network):
+    """Computes a maximum flow from the depots to the clients of a network (Edmonds-Karp Algorithm)
+
+    Slower than dinic, kept as a reference implementation to check results."""
+
+    source, target, tail, head, capacity, succ = get_flow_network(network)
+    flow = [0] * len(tail)
+
+    while True:
+        check_deadline()
+
+        # run a breadth first traversal to find the shortest path from the source to the target
+        queue = deque([source])
+        pred = [-1] * len(succ)
+        while queue and pred[target] < 0:
+            u = queue.popleft()
+            for arc in succ[u]:
+                e = arc >> 1
+                if arc & 1:
+                    v = tail[e]
+                    gap = flow[e]
+                else:
+                    v = head[e]
+                    gap = capacity[e] - flow[e]
+                if gap > 0 and pred[v] < 0 and v != source:
+                    pred[v] = arc
+                    queue.append(v)
+
+        # if there is no path from the source to the target
+        if pred[target] < 0:
+            break
+
+        # look for the biggest flow that can fit in the path
+        path = []
+        v = target
+        while v != source:
+            arc = pred[v]
+            path.append(arc)
+            v = head[arc >> 1] if arc & 1 else tail[arc >> 1]
+        df = min(flow[arc >> 1] if arc & 1 else capacity[arc >> 1] - flow[arc >> 1] for arc in path)
+
+        # update the flow of the chosen path
+        for arc in path:
+            if arc & 1:
+                flow[arc >> 1] -= df
+            else:
+                flow[arc >> 1] += df
+        count('augmenting_paths')
+
+    network.flow[:] = flow[:network.nbr_edges]
+
+    return network
+
+
+def repair_flow(network):
+    """Turns the flow of a network into a flow meeting all demands again, after the demands or capacities changed
+
+    Flows above capacities are cut, then the excess is sent with Dinic blocking flows, so only the flow around the
+    changes moves. Returns False if some excess can't be sent."""
+
+    flow = np.clip(network.flow, 0, network.capacity)
+    excess = (np.bincount(network.head, flow, network.nbr_nodes) - np.bincount(network.tail, flow, network.nbr_nodes)
+              - network.demand).astype(np.int64)
+    surplus = np.flatnonzero(excess > 0)
+    deficit = np.flatnonzero(excess < 0)
+
+    # a source gives its excess to each node with too much flow, a target takes the missing flow of the others
+    source = network.nbr_nodes
+    target = source + 1
+    tail = np.concatenate((network.tail, np.full(len(surplus), source), deficit)).tolist()
+    head = np.concatenate((network.head, surplus, np.full(len(deficit), target))).tolist()
+    capacity = np.concatenate((network.capacity, excess[surplus], -excess[deficit])).tolist()
+    succ = get_succ(tail, head, network.nbr_nodes + 2)
+    flow = flow.tolist() + [0] * (len(surplus) + len(deficit))
+
+    while push_blocking_flow(source, target, tail, head, capacity, flow, succ):
+        pass
+
+    network.flow[:] = flow[:network.nbr_edges]
+
+    return sum(flow[network.nbr_edges:network.nbr_edges + len(surplus)]) == excess[surplus].sum()
+
+
+def get_flow_network(network):
+    """Builds the lists used by the maximum flow algorithms
+
+    A source linked to every depot and a target linked to every client are added after the last node
+    of the network, the edges linking them come after the last edge."""
+
+    source = network.nbr_nodes
+    target = source + 1
+    depots = network.get_depots()
+    clients = network.get_clients()
+
+    tail = np.concatenate((network.tail, np.full(len(depots), source), clients)).tolist()
+    head = np.concatenate((network.head, depots, np.full(len(clients), target))).tolist()
+    capacity = np.concatenate((network.capacity, -network.demand[depots], network.demand[clients])).tolist()
+
+    return source, target, tail, head, capacity, get_succ(tail, head, network.nbr_nodes + 2)
+
+
+def get_succ(tail, head, nbr_nodes):
+    """Lists the arcs leaving each node of a flow network"""
+
+    succ = [[] for _ in range(nbr_nodes)]
+    for e in range(len(tail)):
+        succ[tail[e]].append(2 * e)
+        succ[head[e]].append(2 * e + 1)
+
+    return succ
+
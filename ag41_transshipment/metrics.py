@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: metrics.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Instrumentation of the transshipment solver project
+
+The metrics of the current resolution are kept in a module variable, like the verbosity of the output,
+so the algorithms only have to call count or timer without passing them around."""
+
+import contextlib
+import cProfile
+import json
+import time
+
+
+class Metrics(object):
+    """Timers, counters and cost trajectory of a resolution
+
+    timers hold the time spent in each phase (wall and processor times, in seconds), counters the number of
+    times each event happened and trajectory the (time since the start, cost) pairs of the improvements."""
+
+    def __init__(self, profile=False):
+        """Creates the Metrics object (profile starts the cProfile profiler until the metrics are exported)"""
+
+        self.start = time.perf_counter()
+        self.timers = dict()
+        self.counters = dict()
+        self.trajectory = []
+        self.profiler = None
+        if profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        """Adds the time spent in a with block to the timer of a phase"""
+
+        wall = time.perf_counter()
+        process = time.process_time()
+        try:
+            yield
+        finally:
+            timer = self.timers.setdefault(phase, {'wall_time': 0., 'process_time': 0., 'calls': 0})
+            timer['wall_time'] += time.perf_counter() - wall
+            timer['process_time'] += time.process_time() - process
+            timer['calls'] += 1
+
+    def count(self, counter, value=1):
+        """Increments a counter"""
+
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def record_cost(self, cost):
+        """Adds a new best cost to the trajectory"""
+
+        self.trajectory.append((time.perf_counter() - self.start, cost))
+
+    def to_dict(self):
+        """Returns all metrics in a JSON serializable dictionary"""
+
+        return {
+            'timers': self.timers,
+            'counters': self.counters,
+            'trajectory': [{'time': t, 'cost': cost} for t, cost in self.trajectory],
+            'total_time': time.perf_counter() - self.start
+        }
+
+    def export(self, file_path):
+        """Writes the metrics in a JSON file, and the profile in a .prof file next to it if profiling"""
+
+        with open(file_path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=4)
+            file.write('\n')
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler.dump_stats(file_path.rsplit('.json', 1)[0] + '.prof')
+
+
+METRICS = Metrics()
+
+
+def reset_metrics(profile=False):
+    """Starts the metrics of a new resolution and returns them"""
+
+    global METRICS
+    METRICS = Metrics(profile)
+    return METRICS
+
+
+def get_metrics():
+    """Returns the metrics of the current resolution"""
+
+    return METRICS
+
+
+def timer(phase):
+    """Times a phase of the current resolution (see Metrics.timer)"""
+
+    return METRICS.timer(phase)
+
+
+def count(counter, value=1):
+    """Increments a counter of the current resolution"""
+
+    METRICS.count(counter, value)
+
+
+def record_cost(cost):
+    """Adds a new best cost to the trajectory of the current resolution"""
+
+    METRICS.record_cost(cost)
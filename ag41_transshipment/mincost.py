@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: mincost.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Minimum cost flow algorithms for the transshipment solver project"""
+
+from ag41_transshipment.deadline import check_deadline
+from ag41_transshipment.maxflow import get_flow_network
+from ag41_transshipment.metrics import count
+from ag41_transshipment.network import EPSILON
+import numpy as np
+
+
+def successive_shortest_paths(network, costs=None):
+    """Computes a maximum flow of minimum cost from the depots to the clients (Successive Shortest Paths)
+
+    costs are the unit costs of the edges, by default the unit costs with the fixed costs spread over the
+    capacities."""
+
+    if costs is None:
+        costs = get_linearized_unit_costs(network)
+
+    source, target, tail, head, capacity, succ = get_flow_network(network)
+    cost = np.concatenate((costs, np.zeros(len(tail) - network.nbr_edges)))
+    potential = get_initial_potentials(tail, head, cost, len(succ))
+
+    # arc 2e goes along edge e and arc 2e + 1 goes backward
+    arc_tail = np.empty(2 * len(tail), dtype=np.int64)
+    arc_tail[0::2] = tail
+    arc_tail[1::2] = head
+    arc_head = np.empty(2 * len(tail), dtype=np.int64)
+    arc_head[0::2] = head
+    arc_head[1::2] = tail
+    arc_cost = np.empty(2 * len(tail))
+    arc_cost[0::2] = cost
+    arc_cost[1::2] = -cost
+    capacity = np.asarray(capacity, dtype=np.int64)
+    flow = np.zeros(len(tail), dtype=np.int64)
+    gap = np.empty(2 * len(tail), dtype=np.int64)
+
+    while True:
+        check_deadline()
+        count('shortest_path_phases')
+        gap[0::2] = capacity - flow
+        gap[1::2] = flow
+        dist, pred = get_shortest_paths(source, len(succ), arc_tail, arc_head, arc_cost, gap, potential)
+
+        # if there is no path from the source to the target
+        if dist[target] == float('infinity'):
+            break
+
+        # new potentials keep all reduced costs nonnegative and make shortest paths have zero reduced costs
+        potential += np.minimum(dist, dist[target])
+
+        path = []
+        v = target
+        while v != source:
+            path.append(pred[v])
+            v = arc_tail[pred[v]]
+        path = np.array(path, dtype=np.int64)
+        flow[path >> 1] += np.where(path & 1, -1, 1) * gap[path].min()
+        count('augmenting_paths')
+
+    network.flow[:] = flow[:network.nbr_edges]
+
+    return network
+
+
+def get_shortest_paths(source, nbr_nodes, arc_tail, arc_head, arc_cost, gap, potential):
+    """Computes the distances from the source with reduced costs in the flow network (Bellman-Ford Algorithm)
+
+    Only arcs with a positive gap are used. Returns the distances (infinite if unreachable) and the predecessor arc
+    of each node."""
+
+    arcs = np.flatnonzero(gap > 0)
+    tail = arc_tail[arcs]
+    head = arc_head[arcs]
+    reduced = arc_cost[arcs] + potential[tail] - potential[head]
+
+    dist = np.full(nbr_nodes, float('infinity'))
+    dist[source] = 0.
+    pred = np.full(nbr_nodes, -1, dtype=np.int64)
+    while relax_arcs(dist, pred, arcs, tail, head, reduced):
+        pass
+
+    return dist, pred
+
+
+def relax_arcs(dist, pred, arcs, tail, head, weights):
+    """Relaxes all arcs at once from the distances of the previous pass, returns False if none is improved
+
+    tail, head and weights are those of the arcs, dist and pred (the arc each node is reached by) are updated
+    in place."""
+
+    new_dist = dist[tail] + weights
+    better = np.flatnonzero(new_dist < dist[head] - EPSILON)
+    if len(better) == 0:
+        return False
+
+    # when several arcs improve the same node, the last assignment (the shortest) is kept
+    better = better[np.argsort(-new_dist[better], kind='stable')]
+    dist[head[better]] = new_dist[better]
+    pred[head[better]] = arcs[better]
+
+    return True
+
+
+def get_initial_potentials(tail, head, cost, nbr_nodes):
+    """Computes node potentials making all reduced costs of the empty flow nonnegative (Bellman-Ford)"""
+
+    potential = np.zeros(nbr_nodes)
+    if cost.min(initial=0.) >= 0:
+        return potential
+
+    tail = np.asarray(tail)
+    head = np.asarray(head)
+    for _ in range(nbr_nodes):
+        new_potential = potential.copy()
+        np.minimum.at(new_potential, head, potential[tail] + cost)
+        if (new_potential == potential).all():
+            break
+        potential = new_potential
+
+    return potential
+
+
+def get_linearized_unit_costs(network):
+    """Unit costs of the edges with the fixed costs spread over their capacities"""
+
+    return network.unit_cost + network.fixed_cost / network.capacity
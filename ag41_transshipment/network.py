@@ -0,0 +1,270 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: network.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Array representation of the networks of the transshipment solver project"""
+
+import copy
+import networkx as nx
+import numpy as np
+
+# tolerance used when comparing floating point costs
+EPSILON = 1e-9
+
+
+class Instance(object):
+    """Problem read from a file, with the data of its nodes and edges in arrays
+
+    Nodes and edges keep the ids of the file: tail and head are node ids, not indices."""
+
+    def __init__(self, attributes, node_ids, x, y, demand, node_unit_cost, node_time,
+                 edge_ids, tail, head, capacity, fixed_cost, unit_cost, edge_time):
+        """Creates the Instance object"""
+
+        self.attributes = dict(attributes)
+
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.demand = np.asarray(demand, dtype=np.int64)
+        self.node_unit_cost = np.asarray(node_unit_cost, dtype=np.float64)
+        self.node_time = np.asarray(node_time, dtype=np.float64)
+
+        self.edge_ids = np.asarray(edge_ids, dtype=np.int64)
+        self.tail = np.asarray(tail, dtype=np.int64)
+        self.head = np.asarray(head, dtype=np.int64)
+        self.capacity = np.asarray(capacity, dtype=np.int64)
+        self.fixed_cost = np.asarray(fixed_cost, dtype=np.float64)
+        self.unit_cost = np.asarray(unit_cost, dtype=np.float64)
+        self.edge_time = np.asarray(edge_time, dtype=np.float64)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Creates an instance from a networkx graph as built by the parser"""
+
+        nodes = graph.nodes()
+        edges = graph.edges(data=True)
+
+        return cls(graph.graph, nodes, [graph.node[i]['x'] for i in nodes], [graph.node[i]['y'] for i in nodes],
+                   [graph.node[i]['demand'] for i in nodes], [graph.node[i]['unit_cost'] for i in nodes],
+                   [graph.node[i]['time'] for i in nodes], [edge['id'] for u, v, edge in edges],
+                   [u for u, v, edge in edges], [v for u, v, edge in edges],
+                   [edge['capacity'] for u, v, edge in edges], [edge['fixed_cost'] for u, v, edge in edges],
+                   [edge['unit_cost'] for u, v, edge in edges], [edge['time'] for u, v, edge in edges])
+
+    def to_graph(self):
+        """Creates the networkx graph of the instance, as built by the parser"""
+
+        graph = nx.DiGraph()
+        graph.graph.update(self.attributes)
+        for i, x, y, demand, unit_cost, time in zip(
+                self.node_ids.tolist(), self.x.tolist(), self.y.tolist(), self.demand.tolist(),
+                self.node_unit_cost.tolist(), self.node_time.tolist()):
+            graph.add_node(i, x=x, y=y, demand=demand, unit_cost=unit_cost, time=time, flow=0)
+        for edge_id, u, v, capacity, fixed_cost, unit_cost, time in zip(
+                self.edge_ids.tolist(), self.tail.tolist(), self.head.tolist(), self.capacity.tolist(),
+                self.fixed_cost.tolist(), self.unit_cost.tolist(), self.edge_time.tolist()):
+            graph.add_edge(u, v, id=edge_id, capacity=capacity, fixed_cost=fixed_cost, unit_cost=unit_cost,
+                           time=time, flow=0)
+
+        return graph
+
+    def get_arrays(self):
+        """Returns all arrays of the instance by name"""
+
+        return dict((name, value) for name, value in vars(self).items() if isinstance(value, np.ndarray))
+
+
+class Network(object):
+    """Compact network with integer node indices, edge data in arrays and CSR adjacency
+
+    Nodes are numbered from 0 to nbr_nodes - 1 and edges from 0 to nbr_edges - 1. The labels of the
+    nodes and the ids of the edges are only kept to go back to a networkx graph."""
+
+    def __init__(self, labels, demand, tail, head, edge_ids, capacity, fixed_cost, unit_cost, attributes=None):
+        """Creates the Network object"""
+
+        self.labels = list(labels)
+        self.index = dict((label, i) for i, label in enumerate(self.labels))
+        self.edge_ids = edge_ids if isinstance(edge_ids, CompositeIds) else list(edge_ids)
+        self.attributes = dict(attributes) if attributes is not None else dict()
+
+        self.demand = np.asarray(demand, dtype=np.int64)
+        self.tail = np.asarray(tail, dtype=np.int64)
+        self.head = np.asarray(head, dtype=np.int64)
+        self.capacity = np.asarray(capacity, dtype=np.int64)
+        self.fixed_cost = np.asarray(fixed_cost, dtype=np.float64)
+        self.unit_cost = np.asarray(unit_cost, dtype=np.float64)
+        self.flow = np.zeros(len(self.tail), dtype=np.int64)
+
+        self.out_start, self.out_edges = get_csr(self.tail, len(self.labels))
+        self.in_start, self.in_edges = get_csr(self.head, len(self.labels))
+
+    @property
+    def nbr_nodes(self):
+        """Number of nodes of the network"""
+
+        return len(self.labels)
+
+    @property
+    def nbr_edges(self):
+        """Number of edges of the network"""
+
+        return len(self.tail)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Creates a network from a networkx graph (flows included)"""
+
+        labels = graph.nodes()
+        index = dict((label, i) for i, label in enumerate(labels))
+        edges = graph.edges(data=True)
+
+        network = cls(labels, [graph.node[i]['demand'] for i in labels],
+                      [index[u] for u, v, edge in edges], [index[v] for u, v, edge in edges],
+                      [edge['id'] for u, v, edge in edges], [edge['capacity'] for u, v, edge in edges],
+                      [edge['fixed_cost'] for u, v, edge in edges], [edge['unit_cost'] for u, v, edge in edges],
+                      graph.graph)
+        network.flow[:] = [edge['flow'] for u, v, edge in edges]
+
+        return network
+
+    def to_graph(self):
+        """Creates a networkx graph from the network (flows included)"""
+
+        graph = nx.DiGraph()
+        graph.graph.update(self.attributes)
+        for label, demand in zip(self.labels, self.demand.tolist()):
+            graph.add_node(label, demand=demand)
+        for u, v, edge_id, capacity, fixed_cost, unit_cost, flow in zip(
+                self.tail.tolist(), self.head.tolist(), self.edge_ids, self.capacity.tolist(),
+                self.fixed_cost.tolist(), self.unit_cost.tolist(), self.flow.tolist()):
+            graph.add_edge(self.labels[u], self.labels[v], id=edge_id, capacity=capacity,
+                           fixed_cost=fixed_cost, unit_cost=unit_cost, flow=flow)
+
+        return graph
+
+    def get_cost(self):
+        """Computes the cost of the current flow"""
+
+        used = self.flow > 0
+        return float(np.dot(self.flow, self.unit_cost) + self.fixed_cost[used].sum())
+
+    def copy(self):
+        """Returns a copy of the network sharing its nodes and edges, with its own demands, flows and attributes"""
+
+        network = copy.copy(self)
+        network.demand = self.demand.copy()
+        network.flow = self.flow.copy()
+        network.attributes = dict(self.attributes)
+
+        return network
+
+    def get_components(self):
+        """Lists the weakly connected components of the network, as arrays of node indices"""
+
+        label = get_component_labels(self.tail, self.head, self.nbr_nodes)
+        nodes = np.argsort(label, kind='stable')
+
+        return np.split(nodes, np.flatnonzero(np.diff(label[nodes])) + 1)
+
+    def get_subnetwork(self, nodes):
+        """Returns the network made of some nodes, given by their indices, and the indices of its edges
+
+        The subnetwork keeps the labels, edge ids, attributes and flows of the network."""
+
+        new_index = np.full(self.nbr_nodes, -1, dtype=np.int64)
+        new_index[nodes] = np.arange(len(nodes))
+        edges = np.flatnonzero((new_index[self.tail] >= 0) & (new_index[self.head] >= 0))
+
+        if isinstance(self.edge_ids, CompositeIds):
+            # the ids of the chains are only formatted when accessed
+            edge_ids = self.edge_ids.get_subset(edges)
+        else:
+            edge_ids = [self.edge_ids[e] for e in edges.tolist()]
+
+        network = Network([self.labels[i] for i in nodes.tolist()], self.demand[nodes], new_index[self.tail[edges]],
+                          new_index[self.head[edges]], edge_ids, self.capacity[edges], self.fixed_cost[edges],
+                          self.unit_cost[edges], self.attributes)
+        network.flow[:] = self.flow[edges]
+
+        return network, edges
+
+    def get_used_edges(self):
+        """Lists the indices of the edges carrying flow, by tail node in the order of the labels (as networkx)"""
+
+        return self.out_edges[self.flow[self.out_edges] > 0]
+
+    def get_depots(self):
+        """Lists the indices of all depot nodes"""
+
+        return np.flatnonzero(self.demand < 0)
+
+    def get_clients(self):
+        """Lists the indices of all client nodes"""
+
+        return np.flatnonzero(self.demand > 0)
+
+
+class CompositeIds(object):
+    """Edge ids: a list of ids followed by ids joining the rows of an array, only formatted when accessed
+
+    Used for edges standing for a chain of nodes, which may be far too many to format them all."""
+
+    def __init__(self, ids, parts):
+        """Creates the CompositeIds object"""
+
+        self.ids = list(ids)
+        self.parts = parts
+
+    def __len__(self):
+        return len(self.ids) + len(self.parts)
+
+    def __getitem__(self, e):
+        if e < len(self.ids):
+            return self.ids[e]
+        return '-'.join(str(part) for part in self.parts[e - len(self.ids)].tolist())
+
+    def get_subset(self, edges):
+        """Returns the ids of some edges, given by their increasing indices"""
+
+        first = edges[edges < len(self.ids)]
+        return CompositeIds([self.ids[e] for e in first.tolist()], self.parts[edges[len(first):] - len(self.ids)])
+
+
+def get_csr(nodes, nbr_nodes):
+    """Groups edges by node: the edges of node i are edges[start[i]:start[i + 1]]"""
+
+    edges = np.argsort(nodes, kind='stable')
+    start = np.zeros(nbr_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(nodes, minlength=nbr_nodes), out=start[1:])
+
+    return start, edges
+
+
+def get_component_labels(tail, head, nbr_nodes):
+    """Labels each node with the smallest index of its weakly connected component
+
+    Each pass hooks the label of the end of each edge to the smaller of the two labels, then follows the
+    labels until each one is its own label, so all nodes of a component end with the same label."""
+
+    label = np.arange(nbr_nodes)
+    while True:
+        tail_label = label[tail]
+        head_label = label[head]
+        if np.array_equal(tail_label, head_label):
+            return label
+
+        low = np.minimum(tail_label, head_label)
+        np.minimum.at(label, tail_label, low)
+        np.minimum.at(label, head_label, low)
+        while True:
+            parent = label[label]
+            if np.array_equal(parent, label):
+                break
+            label = parent
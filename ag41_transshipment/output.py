@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: output.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Console output of the transshipment solver project"""
+
+import sys
+import time
+
+# verbosity levels: nothing, costs and times only, full solutions
+QUIET = 0
+SUMMARY = 1
+FULL = 2
+
+VERBOSITY = FULL
+
+
+def set_verbosity(verbosity):
+    """Sets the verbosity level of the console output"""
+
+    global VERBOSITY
+    VERBOSITY = verbosity
+
+
+def display(*args, level=SUMMARY, **kwargs):
+    """Prints a message if the verbosity level is at least level"""
+
+    if VERBOSITY >= level:
+        print(*args, **kwargs)
+
+
+def print_solution(network, cost=None):
+    """Displays all info about the solution of the problem (cost is computed if not given)"""
+
+    if VERBOSITY < FULL:
+        return
+
+    if cost is None:
+        cost = network.get_cost()
+
+    lines = ['']
+    for e in network.get_used_edges().tolist():
+        lines.append('Edge #{} from node #{} to node #{} used with flow={}'.format(
+            network.edge_ids[e], network.labels[network.tail[e]], network.labels[network.head[e]], network.flow[e]))
+    lines.append('\nResult: {}'.format(cost))
+    print('\n'.join(lines))
+
+
+def print_initial_solution(network, cost):
+    """Displays the initial solution"""
+
+    if VERBOSITY < FULL:
+        display('Initial solution: {}'.format(cost))
+        return
+
+    print('\n#####################')
+    print('# Initial solution! #')
+    print('#####################')
+    print_solution(network, cost)
+
+
+def print_improvement(network, cost, u_time, s_time):
+    """Displays a new better solution and the time since the beginning of the optimization"""
+
+    if VERBOSITY < FULL:
+        display('New better solution: {} after {:.3f} seconds'.format(cost, time.time() - u_time))
+        return
+
+    print('\n##############################')
+    print('# New better solution found! #')
+    print('##############################\n')
+    print_solution(network, cost)
+
+    u_tmp = time.time() - u_time
+    s_tmp = time.process_time() - s_time
+
+    u_hour = (u_tmp - (u_tmp % 3600.)) / 3600
+    s_hour = (s_tmp - (s_tmp % 3600.)) / 3600
+
+    u_tmp -= u_hour * 3600.
+    s_tmp -= s_hour * 3600.
+
+    u_min = (u_tmp - (u_tmp % 60.)) / 60
+    s_min = (s_tmp - (s_tmp % 60.)) / 60
+
+    u_tmp -= u_min * 60.
+    s_tmp -= s_min * 60.
+
+    print('\nTime since beginning:')
+    print('\tUser time : {} hours, {} minutes and {} seconds'.format(u_hour, u_min, u_tmp))
+    print('\tSystem time : {} hours, {} minutes and {} seconds\n'.format(s_hour, s_min, s_tmp))
+
+
+def print_execution_time(u_time, s_time):
+    """Displays the execution time of the resolution"""
+
+    if VERBOSITY < FULL:
+        display('Execution time: {:.3f} seconds'.format(u_time))
+        return
+
+    u_hour = (u_time - (u_time % 3600.)) / 3600
+    s_hour = (s_time - (s_time % 3600.)) / 3600
+
+    u_time -= u_hour * 3600.
+    s_time -= s_hour * 3600.
+
+    u_min = (u_time - (u_time % 60.)) / 60
+    s_min = (s_time - (s_time % 60.)) / 60
+
+    u_time -= u_min * 60.
+    s_time -= s_min * 60.
+
+    print('\nExecution time:')
+    print('\tUser time : {} hours, {} minutes and {} seconds'.format(u_hour, u_min, u_time))
+    print('\tSystem time : {} hours, {} minutes and {} seconds\n'.format(s_hour, s_min, s_time))
+
+
+def print_bound(cost, lower_bound, gap):
+    """Displays the lower bound of the problem and the gap of a solution"""
+
+    display('Lower bound: {} (gap: {:.4%} for a cost of {})'.format(lower_bound, gap, cost))
+
+
+def print_target_gap():
+    """Displays that the optimization ended on the target gap"""
+
+    display('Target gap reached!')
+
+
+def print_deadline():
+    """Displays that the optimization ended on the time limit"""
+
+    display('Time limit reached!')
+
+
+def print_interruption():
+    """Displays that the optimization has been interrupted by the user"""
+
+    display('Optimization interrupted!', file=sys.stderr)
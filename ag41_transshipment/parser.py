@@ -9,16 +9,25 @@
 
 """Parser for the transshipment solver project"""
 
-from ag41_transshipment.solver import get_platform_list
-import networkx as nx
+from ag41_transshipment.network import Instance
+from ag41_transshipment.solver import get_gap, get_platform_list
+import csv
+import hashlib
+import json
 import math
+import mmap
+import numpy as np
+import os
+import re
 
 
 class Parser(object):
     """Parser class"""
 
-    def __init__(self, file_path):
-        """Creates the Parser object"""
+    def __init__(self, file_path, use_cache=False):
+        """Creates the Parser object (use_cache enables the binary cache file of the problem)"""
+        self.use_cache = use_cache
+        self.content_hash = None
         try:
             tmp = open(file_path, 'r')
             tmp.close()
@@ -29,89 +38,126 @@ class Parser(object):
     def import_from_file(self):
         """Imports all informations about the problem"""
 
-        file = open(self.file_path, 'r')
-
-        new_graph = nx.DiGraph()
-
-        i = 0
-
-        for line in file.readlines():
-            i += 1
-
-            line = line.split()
-            if '#' in line[0]:
-                pass
-            elif line[0] == 'NODE:':
-                new_graph.add_node(int(line[1]), x=float(line[2]), y=float(line[3]), demand=int(line[4]),
-                                   unit_cost=float(line[5]), time=float(line[6]), flow=0)
-            elif line[0] == 'EDGE:':
-                if float(line[4]) != 0:
-                    new_graph.add_edge(int(line[2]), int(line[3]), id=int(line[1]), capacity=int(line[4]),
-                                       fixed_cost=float(line[5]), unit_cost=float(line[6]), time=float(line[7]), flow=0)
-            elif line[0] == 'NAME':
-                new_graph.graph['name'] = line[2]
-            elif line[0] == 'NBR_NODES':
-                new_graph.graph['nbr_nodes'] = int(line[2])
-            elif line[0] == 'NBR_EDGES':
-                new_graph.graph['nbr_edges'] = int(line[2])
-            elif line[0] == 'T':
-                new_graph.graph['time'] = float(line[2])
-            elif line[0] == 'EOF':
-                break
-            else:
-                raise SyntaxError('File {} has syntax error at line {}'.format(self.file_path, i))
+        return self.import_instance().to_graph()
+
+    def import_instance(self):
+        """Imports all informations about the problem as an Instance
+
+        With the cache enabled, the instance is read from the binary cache file if it was written for the
+        same file content, and the cache file is written otherwise."""
+
+        with open(self.file_path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                content_hash = hashlib.sha1(data).hexdigest()
+                self.content_hash = content_hash
+
+                if self.use_cache:
+                    instance = self.import_cache(content_hash)
+                    if instance is not None:
+                        return instance
+
+                instance = self.parse(iter(data.readline, b''))
+
+        if self.use_cache:
+            self.export_cache(instance, content_hash)
+
+        return instance
 
-        file.close()
+    def parse(self, lines):
+        """Parses the lines of a problem file into an Instance (see parse_lines)"""
 
-        return new_graph
+        return parse_lines(lines, self.file_path)
 
-    def export_to_file(self, init_graph, graph, u_time, s_time):
-        """Exports the solution of the problem"""
+    def get_content_hash(self):
+        """Returns the hash of the content of the problem file, without parsing it"""
 
-        file = open(self.file_path + '.sol', 'w+')
+        if self.content_hash is None:
+            with open(self.file_path, 'rb') as file:
+                self.content_hash = hashlib.sha1(file.read()).hexdigest()
 
-        file.write('###############\n')
-        file.write('# FILE LOADED #\n')
-        file.write('###############\n\n')
+        return self.content_hash
 
-        file.write('Problem file: {}\n'.format(self.file_path))
-        file.write('Solution file: {}\n'.format(self.file_path + '.sol'))
+    def get_cache_path(self):
+        """Returns the path of the binary cache file of the problem"""
 
-        if graph.graph['feasible']:
+        return self.file_path + '.npz'
 
-            file.write('\n####################\n')
-            file.write('# INITIAL SOLUTION #\n')
-            file.write('####################\n\n')
+    def get_solution_path(self, solution_format='text'):
+        """Returns the path of the solution file of the problem in a format (see export_to_file)"""
 
-            cost = 0
-            for u, v in init_graph.edges_iter():
-                if init_graph.edge[u][v]['flow'] > 0:
-                    cost += init_graph.edge[u][v]['flow'] * init_graph.edge[u][v]['unit_cost'] + init_graph.edge[u][v]['fixed_cost']
-                    file.write('Edge #{} from node #{} to node #{} used with flow={}\n'.format(init_graph.edge[u][v]['id'], u, v, init_graph.edge[u][v]['flow']))
+        return self.file_path + ('.sol.jsonl' if solution_format == 'jsonl' else '.sol')
 
-            file.write('\nResult: {}\n'.format(cost))
+    def get_checkpoint_path(self):
+        """Returns the path of the checkpoint file of the resolution"""
 
-            if graph.graph['interrupted']:
-                file.write('\n#####################################\n')
-                file.write('#        BEST SOLUTION FOUND        #\n')
-                file.write('# The program has been interrupted! #\n')
-                file.write('#####################################\n\n')
+        return self.file_path + '.sol.ckpt.npz'
+
+    def import_cache(self, content_hash):
+        """Imports the instance from the binary cache file, returns None if it doesn't match the content"""
+
+        try:
+            with np.load(self.get_cache_path()) as cache:
+                if str(cache['content_hash']) != content_hash:
+                    return None
+                attributes = json.loads(str(cache['attributes']))
+                arrays = dict((name, cache[name]) for name in cache.files
+                              if name not in ('content_hash', 'attributes'))
+        except (IOError, ValueError, KeyError):
+            return None
+
+        return Instance(attributes, **arrays)
+
+    def export_cache(self, instance, content_hash):
+        """Exports the instance to the binary cache file"""
+
+        with open(self.get_cache_path(), 'wb') as file:
+            np.savez(file, content_hash=np.array(content_hash), attributes=np.array(json.dumps(instance.attributes)),
+                     **instance.get_arrays())
+
+    def export_to_file(self, init_network, network, u_time, s_time, solution_format='text'):
+        """Exports the solution of the problem, written at once
+
+        solution_format is either text, for the .sol file, or jsonl, for a .sol.jsonl file with a first line
+        giving the results and then a line for each used edge of the best solution."""
+
+        if solution_format == 'jsonl':
+            self.export_to_jsonl(init_network, network, u_time, s_time)
+            return
+
+        lines = ['###############',
+                 '# FILE LOADED #',
+                 '###############\n',
+                 'Problem file: {}'.format(self.file_path),
+                 'Solution file: {}'.format(self.get_solution_path())]
+
+        if network.attributes['feasible']:
+
+            lines.append('\n####################')
+            lines.append('# INITIAL SOLUTION #')
+            lines.append('####################\n')
+            lines.extend(get_solution_lines(init_network))
+
+            if network.attributes['interrupted']:
+                lines.append('\n#####################################')
+                lines.append('#        BEST SOLUTION FOUND        #')
+                lines.append('# The program has been interrupted! #')
+                lines.append('#####################################\n')
+            elif network.attributes.get('gap_reached'):
+                lines.append('\n######################')
+                lines.append('# TARGET GAP REACHED #')
+                lines.append('######################\n')
             else:
-                file.write('\n####################\n')
-                file.write('# OPTIMAL SOLUTION #\n')
-                file.write('####################\n\n')
-
-            cost = 0
-            for u, v in graph.edges_iter():
-                if graph.edge[u][v]['flow'] > 0:
-                    cost += graph.edge[u][v]['flow'] * graph.edge[u][v]['unit_cost'] + graph.edge[u][v]['fixed_cost']
-                    file.write('Edge #{} from node #{} to node #{} used with flow={}\n'.format(graph.edge[u][v]['id'], u, v,
-                                                                                               graph.edge[u][v]['flow']))
-            file.write('\nResult: {}\n'.format(cost))
-
-            file.write('\n###################\n')
-            file.write('# RESOLUTION TIME #\n')
-            file.write('###################\n\n')
+                lines.append('\n####################')
+                lines.append('# OPTIMAL SOLUTION #')
+                lines.append('####################\n')
+            lines.extend(get_solution_lines(network))
+            if 'lower_bound' in network.attributes:
+                lines.append('Lower bound: {}'.format(network.attributes['lower_bound']))
+                lines.append('Gap: {:.4%}'.format(get_gap(network.get_cost(), network.attributes['lower_bound'])))
+
+            lines.append('\n###################')
+            lines.append('# RESOLUTION TIME #')
+            lines.append('###################\n')
 
             u_hour = (u_time - (u_time % 3600.))/3600
             s_hour = (s_time - (s_time % 3600.))/3600
@@ -125,11 +171,272 @@ class Parser(object):
             u_time -= u_min * 60.
             s_time -= s_min * 60.
 
-            file.write('Execution time:\n')
-            file.write('\tUser time : {} hours, {} minutes and {} seconds\n'.format(u_hour, u_min, u_time))
-            file.write('\tSystem time : {} hours, {} minutes and {} seconds\n'.format(s_hour, s_min, s_time))
+            lines.append('Execution time:')
+            lines.append('\tUser time : {} hours, {} minutes and {} seconds'.format(u_hour, u_min, u_time))
+            lines.append('\tSystem time : {} hours, {} minutes and {} seconds'.format(s_hour, s_min, s_time))
+
+        elif network.attributes['interrupted']:
+            lines.append('\nNo solution found within the time limit!')
+        else:
+            lines.append('\nThe problem can\'t be solved!')
+
+        with open(self.get_solution_path(), 'w+') as file:
+            file.write('\n'.join(lines) + '\n')
+
+    def export_to_jsonl(self, init_network, network, u_time, s_time):
+        """Exports the solution of the problem as JSON lines"""
+
+        feasible = network.attributes['feasible']
+        lower_bound = network.attributes.get('lower_bound') if feasible else None
+        lines = [json.dumps({
+            'problem': self.file_path,
+            'status': get_status(network),
+            'feasible': feasible,
+            'interrupted': network.attributes['interrupted'],
+            'initial_cost': init_network.get_cost() if feasible else None,
+            'cost': network.get_cost() if feasible else None,
+            'lower_bound': lower_bound,
+            'gap': get_gap(network.get_cost(), lower_bound) if lower_bound is not None else None,
+            'user_time': u_time,
+            'system_time': s_time
+        })]
+        if feasible:
+            lines.extend(json.dumps(edge) for edge in get_solution_edges(network))
+
+        with open(self.get_solution_path('jsonl'), 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+
+
+def get_status(network):
+    """Tells how the resolution of a network ended: optimal, target_gap, interrupted or infeasible"""
+
+    if network.attributes['interrupted']:
+        return 'interrupted'
+    if not network.attributes['feasible']:
+        return 'infeasible'
+    if network.attributes.get('gap_reached'):
+        return 'target_gap'
+    return 'optimal'
+
+
+def parse_lines(lines, file_path):
+    """Parses the lines of a problem file into an Instance, file_path only names the problem in errors
+
+    Node and edge records are only gathered while reading, with their line numbers, their numbers are all
+    converted at once."""
+
+    attributes = dict()
+    nodes = []
+    edges = []
+    node_lines = []
+    edge_lines = []
+
+    i = 0
+
+    for line in lines:
+        i += 1
+
+        if line.startswith(b'NODE:'):
+            nodes.append(line[5:])
+            node_lines.append(i)
+            continue
+        elif line.startswith(b'EDGE:'):
+            edges.append(line[5:])
+            edge_lines.append(i)
+            continue
+
+        line = line.decode().split()
+        if not line or '#' in line[0]:
+            pass
+        elif line[0] == 'NODE:':
+            nodes.append(' '.join(line[1:]).encode())
+            node_lines.append(i)
+        elif line[0] == 'EDGE:':
+            edges.append(' '.join(line[1:]).encode())
+            edge_lines.append(i)
+        elif line[0] == 'NAME':
+            attributes['name'] = line[2]
+        elif line[0] == 'NBR_NODES':
+            attributes['nbr_nodes'] = int(line[2])
+        elif line[0] == 'NBR_EDGES':
+            attributes['nbr_edges'] = int(line[2])
+        elif line[0] == 'T':
+            attributes['time'] = float(line[2])
+        elif line[0] == 'EOF':
+            break
+        else:
+            raise SyntaxError('File {} has syntax error at line {}'.format(file_path, i))
+
+    if 'time' not in attributes:
+        raise SyntaxError('File {} has no time limit (T)'.format(file_path))
+
+    nodes = parse_records(nodes, node_lines, NODE_FIELDS, 'NODE', file_path)
+    edges = parse_records(edges, edge_lines, EDGE_FIELDS, 'EDGE', file_path)
+
+    # edges without capacity are useless
+    edges = edges[edges[:, 3] != 0]
+
+    return Instance(attributes, nodes[:, 0], nodes[:, 1], nodes[:, 2], nodes[:, 3], nodes[:, 4], nodes[:, 5],
+                    edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3], edges[:, 4], edges[:, 5], edges[:, 6])
+
+
+def parse_records(records, line_numbers, nbr_fields, name, file_path):
+    """Converts records of numbers into an array with one row per record, line_numbers only locate errors"""
+
+    counts = np.array([len(record.split()) for record in records], dtype=np.int64)
+    wrong = np.flatnonzero(counts != nbr_fields)
+    if len(wrong) > 0:
+        raise SyntaxError('File {} has {} values instead of {} in the {} record at line {}'.format(
+            file_path, counts[wrong[0]], nbr_fields, name, line_numbers[wrong[0]]))
+
+    try:
+        return np.array(b' '.join(records).split(), dtype=np.float64).reshape(-1, nbr_fields)
+    except ValueError:
+        for record, i in zip(records, line_numbers):
+            try:
+                [float(value) for value in record.split()]
+            except ValueError:
+                raise SyntaxError('File {} has syntax error at line {}'.format(file_path, i))
+        raise SyntaxError('File {} has syntax error in {} records'.format(file_path, name))
+
+
+def get_solution_lines(network):
+    """Lists the lines of the .sol file describing a solution (used edges and cost)"""
+
+    lines = []
+    cost = 0
+    for e in network.get_used_edges().tolist():
+        flow = int(network.flow[e])
+        cost += flow * float(network.unit_cost[e]) + float(network.fixed_cost[e])
+        lines.append('Edge #{} from node #{} to node #{} used with flow={}'.format(
+            network.edge_ids[e], network.labels[network.tail[e]], network.labels[network.head[e]], flow))
+    lines.append('\nResult: {}'.format(cost))
+
+    return lines
+
+
+def get_solution_edges(network):
+    """Lists the used edges of a solution, as in the lines of a .sol.jsonl file"""
+
+    return [{'id': network.edge_ids[e], 'from': network.labels[network.tail[e]], 'to': network.labels[network.head[e]],
+             'flow': int(network.flow[e])} for e in network.get_used_edges().tolist()]
+
 
+def import_solution(file_path):
+    """Reads the flows of the best solution in a .sol or .sol.jsonl file, as used by warm_start"""
+
+    flows = dict()
+    with open(file_path, 'r') as file:
+        if file_path.endswith('.jsonl'):
+            for line in file:
+                record = json.loads(line)
+                if 'flow' in record:
+                    flows[(str(record['from']), str(record['to']))] = record['flow']
+            return flows
+
+        # the file gives the initial solution then the best one, each ending with its result
+        section = dict()
+        for line in file:
+            match = SOLUTION_EDGE.match(line)
+            if match is not None:
+                section[(match.group(2), match.group(3))] = int(match.group(4))
+            elif line.startswith('Result:'):
+                flows, section = section, dict()
+
+    return flows
+
+
+def export_instance(instance, file_path):
+    """Writes an instance in a problem file, as read by the Parser"""
+
+    lines = ['NAME : {}'.format(instance.attributes['name']),
+             'NBR_NODES : {}'.format(len(instance.node_ids)),
+             'NBR_EDGES : {}'.format(len(instance.edge_ids)),
+             'T : {}'.format(instance.attributes['time'])]
+    for record in zip(instance.node_ids.tolist(), instance.x.tolist(), instance.y.tolist(), instance.demand.tolist(),
+                      instance.node_unit_cost.tolist(), instance.node_time.tolist()):
+        lines.append('NODE: {} {!r} {!r} {} {!r} {!r}'.format(*record))
+    for record in zip(instance.edge_ids.tolist(), instance.tail.tolist(), instance.head.tolist(),
+                      instance.capacity.tolist(), instance.fixed_cost.tolist(), instance.unit_cost.tolist(),
+                      instance.edge_time.tolist()):
+        lines.append('EDGE: {} {} {} {} {!r} {!r} {!r}'.format(*record))
+    lines.append('EOF')
+
+    with open(file_path, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+def export_summary(summaries, file_path, fields=None):
+    """Exports the summaries of several resolutions (as CSV if the file name ends with .csv, else as JSON)
+
+    fields are the CSV columns, by default SUMMARY_FIELDS."""
+
+    with open(file_path, 'w', newline='') as file:
+        if file_path.endswith('.csv'):
+            writer = csv.DictWriter(file, fieldnames=fields if fields is not None else SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(summaries)
         else:
-            file.write('\nThe problem can\'t be solved!\n')
+            json.dump(summaries, file, indent=4)
+            file.write('\n')
+
+
+def import_scenarios(file_path):
+    """Reads demand scenarios from a CSV file, as a list of (name, demands) with the demands by node id
+
+    The header is a first column (the scenario names) followed by node ids, then each row gives the name of
+    a scenario and the demand of each of these nodes. Nodes left empty keep the demand of the problem."""
+
+    scenarios = []
+    with open(file_path, 'r', newline='') as file:
+        reader = csv.reader(file)
+        node_ids = [int(node_id) for node_id in next(reader)[1:]]
+        for row in reader:
+            if row:
+                scenarios.append((row[0], dict((node_id, int(demand)) for node_id, demand in zip(node_ids, row[1:])
+                                               if demand.strip())))
+
+    return scenarios
+
+
+def export_scenario_flows(results, file_path):
+    """Exports the used edges of the solutions of several scenarios as JSON lines, one line for each edge"""
+
+    with open(file_path, 'w') as file:
+        for result in results:
+            for edge in result['flows']:
+                file.write(json.dumps(dict(scenario=result['scenario'], **edge)) + '\n')
+
+
+def is_problem_file(file_name):
+    """Tells if a file of a data directory is a problem file, not a solution, a cache, a summary or a scenario file"""
+
+    parts = file_name.split('.')
+    return 'sol' not in parts and parts[-1] not in ('npz', 'csv', 'json', 'jsonl')
+
+
+def get_problem_files(directory, excluded=()):
+    """Returns the paths of the problem files of a data directory, sorted, except the excluded paths"""
+
+    excluded = set(os.path.abspath(file_path) for file_path in excluded)
+    file_names = []
+    for file in sorted(os.listdir(directory)):
+        file_name = os.path.join(directory, file)
+        if is_problem_file(file) and os.path.isfile(file_name) and os.path.abspath(file_name) not in excluded:
+            file_names.append(file_name)
+
+    return file_names
+
+
+# edge of a solution in a .sol file
+SOLUTION_EDGE = re.compile(r'Edge #(\S+) from node #(\S+) to node #(\S+) used with flow=(\d+)')
+
+# number of values in the NODE and EDGE records of a problem file
+NODE_FIELDS = 6
+EDGE_FIELDS = 7
+
+SCENARIO_FIELDS = ['scenario', 'feasible', 'initial_cost', 'cost', 'lower_bound', 'gap', 'interrupted', 'warm_start',
+                   'user_time', 'system_time']
 
-        file.close()
+SUMMARY_FIELDS = ['instance', 'feasible', 'initial_cost', 'best_cost', 'lower_bound', 'gap', 'interrupted',
+                  'user_time', 'system_time', 'wall_time', 'cached', 'error']
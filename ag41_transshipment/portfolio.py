@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: portfolio.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Parallel portfolio search for the transshipment solver project"""
+
+from ag41_transshipment.deadline import DeadlineReached, limit_time
+from ag41_transshipment.metrics import count, get_metrics, record_cost, reset_metrics, timer
+from ag41_transshipment.network import EPSILON
+from ag41_transshipment.residual import ResidualGraph
+from ag41_transshipment.output import QUIET, print_deadline, print_improvement, print_interruption, \
+    print_target_gap, set_verbosity
+from ag41_transshipment.solver import CYCLE_SEARCHES, METAHEURISTICS, TargetGapReached, check_gap, get_gap
+import multiprocessing
+import numpy as np
+import queue
+import time
+
+# time (in seconds) given to the workers to end by themselves after a Ctrl-C, before they are terminated
+STOP_TIMEOUT = 1.
+
+
+class Incumbent(object):
+    """Best solution shared by the processes of a portfolio"""
+
+    def __init__(self, network):
+        """Creates the Incumbent object from the starting solution of a network"""
+
+        self.lock = multiprocessing.Lock()
+        self.cost = multiprocessing.Value('d', network.get_cost(), lock=False)
+        self.flow = multiprocessing.Array('q', network.flow.tolist(), lock=False)
+        self.interrupted = multiprocessing.Value('b', False, lock=False)
+
+    def offer(self, cost, flow):
+        """Keeps a flow if it is better than the incumbent"""
+
+        with self.lock:
+            if cost < self.cost.value - EPSILON:
+                self.cost.value = cost
+                self.flow[:] = flow.tolist()
+
+    def get(self, timeout=-1):
+        """Returns the cost and the flow of the incumbent, None if it isn't available within timeout seconds
+        (a worker terminated while offering a flow keeps it locked)"""
+
+        if not self.lock.acquire(timeout=timeout):
+            return None
+        try:
+            return self.cost.value, np.array(self.flow[:], dtype=np.int64)
+        finally:
+            self.lock.release()
+
+
+def solve_portfolio(network, max_time, workers, method='slope_scaling', target_gap=None, checkpoint=None):
+    """Solves the problem with several searches running in parallel processes, sharing the incumbent
+
+    Worker i runs method with seed i, or a slope scaling when method is a cycle search and i > 0. The best flow of
+    all workers is kept in the network, the best flow shared so far when interrupted by the user."""
+
+    u_time = time.time()
+    s_time = time.process_time()
+
+    incumbent = Incumbent(network)
+    counters = multiprocessing.Queue()
+    lower_bound = network.attributes.get('lower_bound')
+    if checkpoint is not None:
+        checkpoint.start(network, incumbent.get)
+
+    processes = []
+    received = 0
+    cancelled = False
+    try:
+        with timer('cycle_search'):
+            for seed in range(workers):
+                worker_method = method if seed == 0 or method in METAHEURISTICS else 'slope_scaling'
+                process = multiprocessing.Process(target=run_worker, args=(network, u_time, max_time,
+                                                                           worker_method, seed, incumbent,
+                                                                           counters, lower_bound, target_gap))
+                process.start()
+                processes.append(process)
+
+            # the counters are read before joining, a process can't end while its queue data isn't consumed
+            while received < len(processes):
+                for counter, value in counters.get().items():
+                    count(counter, value)
+                received += 1
+            for process in processes:
+                process.join()
+
+    except KeyboardInterrupt:
+        cancelled = True
+        stop_workers(processes, counters, len(processes) - received)
+
+    if checkpoint is not None:
+        checkpoint.stop()
+
+    best = incumbent.get(STOP_TIMEOUT if cancelled else -1)
+    if best is None:
+        # the incumbent was left locked, the flow can't be trusted: the starting flow of the network is kept
+        best = network.get_cost(), network.flow.copy()
+    cost, network.flow[:] = best
+    network.attributes['cost'] = cost
+    gap_reached = target_gap is not None and lower_bound is not None and get_gap(cost, lower_bound) <= target_gap
+    network.attributes['interrupted'] = (bool(incumbent.interrupted.value) and not gap_reached) or cancelled
+    network.attributes['cancelled'] = cancelled
+    network.attributes['gap_reached'] = gap_reached and not cancelled
+    record_cost(cost)
+
+    print_improvement(network, cost, u_time, s_time)
+    if cancelled:
+        print_interruption()
+    elif gap_reached:
+        print_target_gap()
+    elif network.attributes['interrupted']:
+        print_deadline()
+
+    return network
+
+
+def stop_workers(processes, counters, waiting):
+    """Stops the workers of a portfolio after a Ctrl-C, waiting still has to be read from counters
+
+    A Ctrl-C from the terminal reaches the workers too, they end by themselves and send their counters. The
+    workers still running after STOP_TIMEOUT seconds, or never told, are terminated."""
+
+    end = time.time() + STOP_TIMEOUT
+    while waiting > 0 and time.time() < end:
+        try:
+            for counter, value in counters.get(timeout=max(end - time.time(), 0)).items():
+                count(counter, value)
+            waiting -= 1
+        except queue.Empty:
+            break
+
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join()
+
+
+def run_worker(network, u_time, max_time, method, seed, incumbent, counters, lower_bound=None, target_gap=None):
+    """Runs one search of a portfolio (in a worker process), its counters are sent back in a queue"""
+
+    set_verbosity(QUIET)
+    reset_metrics()
+    residual = ResidualGraph(network)
+
+    def report():
+        incumbent.offer(residual.cost, network.flow)
+        check_gap(residual.cost, lower_bound, target_gap)
+
+    def get_incumbent():
+        cost, flow = incumbent.get()
+        check_gap(cost, lower_bound, target_gap)
+        return cost, flow
+
+    try:
+        with limit_time(max_time, u_time):
+            if method in METAHEURISTICS:
+                METAHEURISTICS[method](residual, u_time, max_time, report, seed, get_incumbent)
+            else:
+                improve = CYCLE_SEARCHES[method]
+                while improve(residual, u_time, max_time):
+                    report()
+
+    except TargetGapReached:
+        pass
+    except (DeadlineReached, KeyboardInterrupt):
+        # a Ctrl-C reaches the main process too, which stops the portfolio
+        incumbent.interrupted.value = True
+    finally:
+        counters.put(get_metrics().counters)
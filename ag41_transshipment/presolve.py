@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: presolve.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Reduction of the instances before their expansion for the transshipment solver project"""
+
+from ag41_transshipment.network import Instance
+from ag41_transshipment.solver import get_chains
+import numpy as np
+
+
+def presolve_instance(instance):
+    """Returns a smaller instance with the same optimal solutions, and the number of reductions of each kind
+
+    Edges in no chain within the time limit and dominated parallel edges are removed, and capacities are tightened
+    to the most flow each edge can carry. Edges keep their ids."""
+
+    tail, head, dp, cp, first, second = get_chains(instance)
+    supply = np.maximum(-instance.demand, 0)
+    demand = np.maximum(instance.demand, 0)
+
+    # most flow through each edge: only each distinct client (or depot) of its chains counts
+    client = head[cp[second]]
+    depot = tail[dp[first]]
+    dp_bound = np.minimum(supply[tail[dp]], get_distinct_sums(first, client, demand, len(dp)))
+    cp_bound = np.minimum(demand[head[cp]], get_distinct_sums(second, depot, supply, len(cp)))
+
+    edges = np.concatenate((dp, cp))
+    bound = np.concatenate((dp_bound, cp_bound))
+    capacity = instance.capacity.copy()
+    capacity[edges] = np.minimum(capacity[edges], bound)
+
+    # edges in no chain get a bound of 0
+    reachable = edges[bound > 0]
+    dominated = get_dominated_edges(reachable, tail[reachable], head[reachable], instance.fixed_cost[reachable],
+                                    instance.unit_cost[reachable], instance.edge_time[reachable],
+                                    capacity[reachable] >= bound[bound > 0])
+    kept = np.setdiff1d(reachable, dominated)
+
+    used_nodes = np.zeros(len(instance.node_ids), dtype=bool)
+    used_nodes[tail[kept]] = True
+    used_nodes[head[kept]] = True
+    nodes = np.flatnonzero(used_nodes | (instance.demand != 0))
+
+    attributes = dict(instance.attributes)
+    attributes['nbr_nodes'] = len(nodes)
+    attributes['nbr_edges'] = len(kept)
+
+    reductions = {
+        'unreachable_edges': len(instance.edge_ids) - len(reachable),
+        'dominated_edges': len(dominated),
+        'tightened_edges': int((capacity[kept] < instance.capacity[kept]).sum()),
+        'removed_platforms': int(((instance.demand == 0) & ~used_nodes).sum())
+    }
+
+    return Instance(attributes, instance.node_ids[nodes], instance.x[nodes], instance.y[nodes],
+                    instance.demand[nodes], instance.node_unit_cost[nodes], instance.node_time[nodes],
+                    instance.edge_ids[kept], instance.tail[kept], instance.head[kept], capacity[kept],
+                    instance.fixed_cost[kept], instance.unit_cost[kept], instance.edge_time[kept]), reductions
+
+
+def get_distinct_sums(group, item, value, nbr_groups):
+    """Sums the values of the distinct items of each group, given as pairs (group[k], item[k])"""
+
+    pairs = np.unique(np.stack((group, item), axis=1), axis=0)
+
+    return np.bincount(pairs[:, 0], weights=value[pairs[:, 1]], minlength=nbr_groups).astype(np.int64)
+
+
+def get_dominated_edges(edges, tail, head, fixed_cost, unit_cost, time, unbounded):
+    """Lists the edges dominated by a parallel edge, which are never needed in an optimal solution
+
+    An edge is dominated by a parallel edge no worse on costs and time whose capacity is never binding. Of equal
+    edges, the first one is kept."""
+
+    dominated = []
+    order = np.lexsort((edges, head, tail))
+    same = (np.diff(tail[order]) == 0) & (np.diff(head[order]) == 0)
+    # groups of parallel edges are runs of the same tail and head in order
+    starts = np.flatnonzero(np.concatenate(([True], ~same)))
+    ends = np.concatenate((starts[1:], [len(order)]))
+
+    for start, end in zip(starts[ends - starts > 1].tolist(), ends[ends - starts > 1].tolist()):
+        group = order[start:end]
+        for i in group.tolist():
+            for j in group.tolist():
+                if i == j or not unbounded[j]:
+                    continue
+                no_worse = fixed_cost[j] <= fixed_cost[i] and unit_cost[j] <= unit_cost[i] and time[j] <= time[i]
+                better = fixed_cost[j] < fixed_cost[i] or unit_cost[j] < unit_cost[i] or time[j] < time[i]
+                if no_worse and (better or j < i):
+                    dominated.append(edges[i])
+                    break
+
+    return np.array(dominated, dtype=np.int64)
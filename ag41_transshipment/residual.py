@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: residual.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Residual (gap) graph of a solution for the transshipment solver project"""
+
+import networkx as nx
+import numpy as np
+
+
+class ResidualGraph(object):
+    """Gap graph of a network flow, kept up to date in place when flow is pushed
+
+    Arc 2e adds flow to edge e and arc 2e + 1 removes flow from it. Pushes are recorded in an undo log until they
+    are committed, and cost is the cost of the current flow."""
+
+    def __init__(self, network):
+        """Creates the residual graph of a network"""
+
+        self.network = network
+        self.log = []
+        self.cost = network.get_cost()
+        # cost change of the pushes not committed yet
+        self.pending = 0
+
+        self.tail = np.empty(2 * network.nbr_edges, dtype=np.int64)
+        self.tail[0::2] = network.tail
+        self.tail[1::2] = network.head
+        self.head = np.empty(2 * network.nbr_edges, dtype=np.int64)
+        self.head[0::2] = network.head
+        self.head[1::2] = network.tail
+
+    def get_capacity(self, arc):
+        """Returns the flow that can still be pushed along an arc"""
+
+        e = arc >> 1
+        if arc & 1:
+            return int(self.network.flow[e])
+        return int(self.network.capacity[e] - self.network.flow[e])
+
+    def get_capacities(self):
+        """Returns the capacities of all arcs"""
+
+        capacities = np.empty(2 * self.network.nbr_edges, dtype=np.int64)
+        capacities[0::2] = self.network.capacity - self.network.flow
+        capacities[1::2] = self.network.flow
+
+        return capacities
+
+    def get_unit_costs(self):
+        """Returns the unit costs of all arcs"""
+
+        unit_costs = np.empty(2 * self.network.nbr_edges, dtype=np.float64)
+        unit_costs[0::2] = self.network.unit_cost
+        unit_costs[1::2] = -self.network.unit_cost
+
+        return unit_costs
+
+    def get_cycle_capacity(self, cycle):
+        """Computes the maximum flow that can be pushed along a cycle of arcs"""
+
+        return min(self.get_capacity(arc) for arc in cycle)
+
+    def push(self, cycle, amount):
+        """Pushes flow along a cycle of arcs and returns the cost change of the solution"""
+
+        delta = 0
+        for arc in cycle:
+            e = arc >> 1
+            delta -= self.get_edge_cost(e)
+            if arc & 1:
+                self.network.flow[e] -= amount
+            else:
+                self.network.flow[e] += amount
+            delta += self.get_edge_cost(e)
+            self.log.append((arc, amount))
+
+        self.cost += delta
+        self.pending += delta
+        return delta
+
+    def undo(self):
+        """Cancels all pushes made since the last commit"""
+
+        while self.log:
+            arc, amount = self.log.pop()
+            if arc & 1:
+                self.network.flow[arc >> 1] += amount
+            else:
+                self.network.flow[arc >> 1] -= amount
+        self.cost -= self.pending
+        self.pending = 0
+
+    def commit(self):
+        """Validates all pushes made since the last commit"""
+
+        self.log = []
+        self.pending = 0
+
+    def reset(self):
+        """Forgets the undo log and computes the cost again, after the network flow was changed directly"""
+
+        self.log = []
+        self.cost = self.network.get_cost()
+        self.pending = 0
+
+    def get_edge_cost(self, e):
+        """Computes the cost of an edge of the network"""
+
+        flow = int(self.network.flow[e])
+        if flow > 0:
+            return flow * float(self.network.unit_cost[e]) + float(self.network.fixed_cost[e])
+        return 0
+
+    def get_gap_graph(self):
+        """Builds the gap graph as a networkx graph on node indices, each edge keeping the arc it comes from"""
+
+        gap_graph = nx.DiGraph()
+        gap_graph.add_nodes_from(range(self.network.nbr_nodes))
+        for arc in np.flatnonzero(self.get_capacities() > 0).tolist():
+            gap_graph.add_edge(int(self.tail[arc]), int(self.head[arc]), arc=arc)
+
+        return gap_graph
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: result_cache.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Cache of the results of past resolutions for the transshipment solver project"""
+
+import hashlib
+import json
+import os
+
+# default folder of the result cache
+RESULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ag41_transshipment')
+
+# default number of results kept in the result cache
+RESULT_CACHE_SIZE = 1000
+
+
+class ResultCache(object):
+    """Results of past resolutions, kept in a folder with a JSON file for each result
+
+    Results are found by a key hashing the content of the problem with the configuration (see get_key). Beyond size
+    results, the least recently used ones are removed."""
+
+    def __init__(self, directory=RESULT_CACHE_DIR, size=RESULT_CACHE_SIZE):
+        """Creates the ResultCache object"""
+
+        self.directory = directory
+        self.size = size
+
+    def get_key(self, content_hash, configuration):
+        """Returns the key of the result of a problem, from the hash of its content and the solver configuration
+
+        configuration is a JSON serializable dictionary of everything changing the solution: the method, the
+        initial flow, the time budget and the options of the resolution."""
+
+        data = json.dumps([content_hash, configuration], sort_keys=True)
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def get_path(self, key):
+        """Returns the path of the file of a result"""
+
+        return os.path.join(self.directory, key + '.json')
+
+    def load(self, key):
+        """Returns the result of a key, None if it isn't in the cache"""
+
+        try:
+            with open(self.get_path(key), 'r') as file:
+                entry = json.load(file)
+            os.utime(self.get_path(key))
+        except (IOError, ValueError):
+            return None
+
+        return entry
+
+    def store(self, key, entry):
+        """Adds a result to the cache, written at once so it is never read half written, and evicts the oldest"""
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.get_path(key) + '.{}.tmp'.format(os.getpid())
+        with open(tmp_path, 'w') as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, self.get_path(key))
+        self.evict()
+
+    def evict(self):
+        """Removes the least recently used results beyond the size of the cache"""
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    # removed by another process in the meantime
+                    pass
+
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.size, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def relocate_solution(solution, old_path, new_path):
+    """Replaces the path of the problem in the content of a solution file (text or JSON lines)"""
+
+    if old_path == new_path:
+        return solution
+
+    if solution.startswith('{'):
+        # the first line of a .sol.jsonl file gives the results, with the path of the problem
+        header, edges = solution.split('\n', 1)
+        results = json.loads(header)
+        results['problem'] = new_path
+        return json.dumps(results) + '\n' + edges
+
+    solution = solution.replace('Problem file: {}\n'.format(old_path), 'Problem file: {}\n'.format(new_path), 1)
+    return solution.replace('Solution file: {}.sol\n'.format(old_path), 'Solution file: {}.sol\n'.format(new_path), 1)
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: scenarios.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Resolution of a problem under several demand scenarios for the transshipment solver project"""
+
+from ag41_transshipment.app import silence_output
+from ag41_transshipment.metrics import timer
+from ag41_transshipment.output import display
+from ag41_transshipment.parser import Parser
+from ag41_transshipment.service import solve_network
+from ag41_transshipment.solver import expand_network
+import multiprocessing
+import numpy as np
+
+
+def solve_scenarios(file_name, scenarios, max_time, method='negative_cycle', initial_flow='dinic', workers=1,
+                    lower_bound=False):
+    """Solves the problem in a file under each of several demand scenarios and returns their results
+
+    The problem is expanded once. With one worker, each scenario starts from the solution of the closest one
+    solved, else they are solved in parallel. Each scenario has its own max_time."""
+
+    with timer('parse'):
+        instance = Parser(file_name).import_instance()
+    with timer('expand'):
+        network = expand_network(instance)
+    demands = np.array([get_scenario_demand(network, name, scenario) for name, scenario in scenarios])
+
+    if workers > 1:
+        tasks = [(get_scenario_network(network, demand), max_time, method, initial_flow, 0, lower_bound, None)
+                 for demand in demands]
+        with multiprocessing.Pool(workers, initializer=silence_output) as pool:
+            results = pool.starmap(solve_network, tasks)
+        for result, (name, scenario) in zip(results, scenarios):
+            result['scenario'] = name
+            result['warm_start'] = None
+        return results
+
+    results = [None] * len(scenarios)
+    # distance of each scenario to the closest one solved, and that one
+    distance = np.full(len(scenarios), np.inf)
+    closest = np.full(len(scenarios), -1, dtype=np.int64)
+    for _ in range(len(scenarios)):
+        unsolved = np.flatnonzero([result is None for result in results])
+        i = unsolved[np.argmin(distance[unsolved])]
+
+        warm_flows = None
+        if closest[i] >= 0 and results[closest[i]]['feasible']:
+            warm_flows = dict(((str(edge['from']), str(edge['to'])), edge['flow'])
+                              for edge in results[closest[i]]['flows'])
+        results[i] = solve_network(get_scenario_network(network, demands[i]), max_time, method, initial_flow, 0,
+                                   lower_bound, None, warm_flows)
+        results[i]['scenario'] = scenarios[i][0]
+        results[i]['warm_start'] = scenarios[closest[i]][0] if results[i]['warm_start'] else None
+
+        display('{}: {} (initial: {} from {}, {:.3f} seconds)'.format(
+            scenarios[i][0], results[i]['cost'], results[i]['initial_cost'],
+            results[i]['warm_start'] or initial_flow, results[i]['user_time']))
+
+        new_distance = np.abs(demands - demands[i]).sum(axis=1)
+        closer = new_distance < distance
+        distance[closer] = new_distance[closer]
+        closest[closer] = i
+
+    return results
+
+
+def get_scenario_demand(network, name, scenario):
+    """Returns the demands of the nodes of an expanded network under a scenario, checking their roles and sum"""
+
+    demand = network.demand.copy()
+    for node_id, value in scenario.items():
+        if node_id not in network.index:
+            raise ValueError('Scenario {} has unknown node {}'.format(name, node_id))
+        i = network.index[node_id]
+        if demand[i] * value < 0:
+            raise ValueError('Scenario {} changes the role of node {}'.format(name, node_id))
+        demand[i] = value
+    if demand.sum() != 0:
+        raise ValueError('Scenario {} has demands summing to {} instead of 0'.format(name, demand.sum()))
+
+    return demand
+
+
+def get_scenario_network(network, demand):
+    """Returns a copy of an expanded network with other demands and no flow"""
+
+    scenario_network = network.copy()
+    scenario_network.demand[:] = demand
+    scenario_network.flow[:] = 0
+
+    return scenario_network
@@ -0,0 +1,242 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: service.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Long-running solver service of the transshipment solver project"""
+
+from ag41_transshipment.app import silence_output
+from ag41_transshipment.deadline import clear_deadline, get_time_left, set_deadline
+from ag41_transshipment.metrics import reset_metrics, timer
+from ag41_transshipment.output import FULL, display
+from ag41_transshipment.parser import get_solution_edges, parse_lines
+from ag41_transshipment.solver import CYCLE_SEARCHES, INITIAL_FLOWS, METAHEURISTICS, expand_network, get_gap, \
+    initialize_network, solve, test_feasibility
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import json
+import sys
+import threading
+import time
+
+# default port of the service, on localhost only
+SERVICE_PORT = 8041
+
+# default number of expanded networks kept by the service
+CACHE_SIZE = 32
+
+
+class SolverService(object):
+    """Solves problems in a pool of worker processes, keeping the networks of the last problems expanded
+
+    Networks are cached by the hash of their problem, so the same problem is neither parsed nor expanded again."""
+
+    def __init__(self, workers=1, cache_size=CACHE_SIZE):
+        """Creates the SolverService object"""
+
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.pool = ProcessPoolExecutor(workers, initializer=silence_output)
+        self.workers = workers
+
+    def get_network(self, data, name):
+        """Returns the expanded network of a problem from the content of its file and whether it was cached"""
+
+        content_hash = hashlib.sha1(data).hexdigest()
+        with self.lock:
+            if content_hash in self.cache:
+                self.cache.move_to_end(content_hash)
+                return self.cache[content_hash], content_hash, True
+
+        # expanded outside of the lock, two requests of a new problem at once may both expand it
+        network = expand_network(parse_lines(iter(data.splitlines(True)), name))
+        with self.lock:
+            self.cache[content_hash] = network
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        return network, content_hash, False
+
+    def solve(self, request):
+        """Solves the problem of a request (a dictionary of its JSON fields) and returns its result
+
+        Raises ValueError, or SyntaxError for the problem, if the request is invalid."""
+
+        start = time.time()
+        if 'file' in request:
+            name = request['file']
+            try:
+                with open(name, 'rb') as file:
+                    data = file.read()
+            except IOError:
+                raise ValueError('File {} doesn\'t exist'.format(name))
+        elif 'instance' in request:
+            name = '<inline>'
+            data = request['instance'].encode()
+        else:
+            raise ValueError('The request has neither file nor instance')
+
+        method = request.get('method', 'negative_cycle')
+        initial_flow = request.get('initial_flow', 'dinic')
+        if method not in CYCLE_SEARCHES and method not in METAHEURISTICS:
+            raise ValueError('Unknown method {}'.format(method))
+        if initial_flow not in INITIAL_FLOWS:
+            raise ValueError('Unknown initial flow {}'.format(initial_flow))
+        max_time = get_number(request, 'max_time', 1000)
+        seed = get_number(request, 'seed', 0, int)
+        target_gap = get_number(request, 'gap', None)
+
+        network, content_hash, cached = self.get_network(data, name)
+        result = self.pool.submit(solve_network, network, max_time, method, initial_flow, seed,
+                                  bool(request.get('bound')) or target_gap is not None, target_gap).result()
+        with self.lock:
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+        result.update({
+            'problem': name,
+            'content_hash': content_hash,
+            'cached': cached,
+            'wall_time': time.time() - start
+        })
+
+        return result
+
+    def get_status(self):
+        """Returns the state of the service: its workers and the use of its cache"""
+
+        with self.lock:
+            return {
+                'workers': self.workers,
+                'cache_size': self.cache_size,
+                'cached_networks': len(self.cache),
+                'cache_hits': self.hits,
+                'cache_misses': self.misses
+            }
+
+    def shutdown(self):
+        """Stops the worker processes"""
+
+        self.pool.shutdown()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP requests of the service: POST /solve with a JSON request, GET /status"""
+
+    def do_GET(self):
+        if self.path == '/status':
+            self.send_json(200, self.server.service.get_status())
+        else:
+            self.send_json(404, {'error': 'Unknown path {}'.format(self.path)})
+
+    def do_POST(self):
+        if self.path != '/solve':
+            self.send_json(404, {'error': 'Unknown path {}'.format(self.path)})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length).decode())
+            if not isinstance(request, dict):
+                raise ValueError('The request isn\'t a JSON object')
+            result = self.server.service.solve(request)
+        except (ValueError, SyntaxError) as error:
+            self.send_json(400, {'error': str(error)})
+        except Exception as error:
+            self.send_json(500, {'error': '{}: {}'.format(type(error).__name__, error)})
+        else:
+            self.send_json(200, result)
+
+    def send_json(self, status, content):
+        """Sends a JSON response"""
+
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        display('{} - {}'.format(self.address_string(), format % args), level=FULL, file=sys.stderr)
+
+
+def get_number(request, key, default, number_type=float):
+    """Returns a nonnegative number of a request (default if not given), raises ValueError if it isn't one"""
+
+    value = request.get(key, default)
+    if value is None and default is None:
+        return None
+    try:
+        number = number_type(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError('Invalid {} {}'.format(key, value))
+    if not number >= 0:
+        raise ValueError('Invalid {} {}, it must be a nonnegative number'.format(key, value))
+
+    return number
+
+
+def solve_network(network, max_time, method, initial_flow, seed, lower_bound, target_gap, warm_flows=None):
+    """Solves the problem of an expanded network and returns the result of its resolution (in a worker process)
+
+    The result is the content of a .sol.jsonl file with the metrics. max_time is a deadline from the initial
+    solution."""
+
+    metrics = reset_metrics()
+    u_time = time.time()
+    s_time = time.process_time()
+    set_deadline(max_time, u_time)
+
+    initialize_network(network, initial_flow, lower_bound, warm_flows)
+    feasible = test_feasibility(network)
+    initial_cost = network.attributes['cost'] if feasible else None
+    if feasible:
+        network = solve(network, get_time_left(), method, seed, target_gap)
+    clear_deadline()
+
+    cost = network.attributes['cost'] if feasible else None
+    lower_bound = network.attributes.get('lower_bound') if feasible else None
+    with timer('export'):
+        flows = get_solution_edges(network) if feasible else []
+
+    return {
+        'feasible': feasible,
+        'interrupted': network.attributes.get('interrupted', False),
+        'warm_start': network.attributes['warm_start'],
+        'initial_cost': initial_cost,
+        'cost': cost,
+        'lower_bound': lower_bound,
+        'gap': get_gap(cost, lower_bound) if lower_bound is not None else None,
+        'user_time': time.time() - u_time,
+        'system_time': time.process_time() - s_time,
+        'metrics': metrics.to_dict(),
+        'flows': flows
+    }
+
+
+def run_service(port=SERVICE_PORT, workers=1, cache_size=CACHE_SIZE):
+    """Serves solve requests on localhost until interrupted"""
+
+    service = SolverService(workers, cache_size)
+    server = ThreadingHTTPServer(('127.0.0.1', port), ServiceHandler)
+    server.service = service
+
+    display('Solver service listening on http://127.0.0.1:{} ({} workers)'.format(port, workers))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -9,169 +9,525 @@
 
 """Solver file for the transshipment solver project"""
 
+from ag41_transshipment.deadline import DeadlineReached, check_deadline, get_time_left, limit_time
+from ag41_transshipment.lazy import fold_chains, get_ladders, run_with_shortcuts
+from ag41_transshipment.maxflow import dinic, edmonds_karp, repair_flow
+from ag41_transshipment.metrics import count, record_cost, timer
+from ag41_transshipment.mincost import get_linearized_unit_costs, relax_arcs, successive_shortest_paths
+from ag41_transshipment.network import EPSILON, CompositeIds, Instance, Network
+from ag41_transshipment.output import print_deadline, print_improvement, print_interruption, print_target_gap
+from ag41_transshipment.residual import ResidualGraph
+import collections
 import networkx as nx
-import sys
+import numpy as np
 import time
 
+# maximum relative change of the slopes when the slope scaling is stuck
+SLOPE_PERTURBATION = 0.3
 
-def initialize(graph):
-    """Defines an initial solution of maximum flow for the transshipment problem (Edmonds-Karp Algorithm)"""
-    graph = expand(graph)
-    old_graph = graph.copy()
+# moves without improvement after which the large neighborhood search restarts from the incumbent
+LNS_RESTART = 100
 
-    # initialization of source node
-    graph.add_node('s', demand=0, time=0, flow=0)
-    for depot in get_depot_list(graph):
-        graph.add_edge('s', depot, capacity=-graph.node[depot]['demand'], time=0, flow=0)
-        graph.node['s']['demand'] -= graph.node[depot]['demand']
+# share of the time left given to a warm start or a min_cost initial flow, the rest is kept for dinic
+INITIAL_FLOW_SHARE = 0.5
 
-    # initialization of target node
-    graph.add_node('t', demand=0, time=0, flow=0)
-    for client in get_client_list(graph):
-        graph.add_edge(client, 't', capacity=graph.node[client]['demand'], time=0, flow=0)
-        graph.node['t']['demand'] += graph.node[client]['demand']
+# share of the time left given to the lower bound, the rest is kept for the optimization
+LOWER_BOUND_SHARE = 0.5
 
-    # initialization of reverse edges
-    for (u, v) in graph.edges():
-        graph.add_edge(v, u, capacity=0, time=0, flow=0)
 
-    # body of the maximum flow
+class TargetGapReached(Exception):
+    """Raised to end the optimization when the best solution is close enough to the lower bound"""
 
-    while True:
 
-        # run a breadth first traversal to find the shortest path from the source to the path
-        queue = ['s']
-        pred = dict()
-        while queue != []:
-            u = queue.pop(0)
-            for v in graph.successors(u):
-                if v not in pred and v != 's' and graph.edge[u][v]['capacity'] > graph.edge[u][v]['flow']:
-                    pred[v] = (u, v)
-                    queue.append(v)
-
-        # if there is no path from the source to the target
-        if 't' not in pred:
-            break
-
-        # look for the biggest flow that can fit in the path
-        df = float('infinity')
-        prev = 't'
-        while prev != 's':
-            (u, v) = pred[prev]
-            df = min(df, graph.edge[u][v]['capacity'] - graph.edge[u][v]['flow'])
-            prev = u
-
-        # update the flow of the chosen path
-        prev = 't'
-        while prev != 's':
-            (u, v) = pred[prev]
-            graph.edge[u][v]['flow'] += df
-            graph.edge[v][u]['flow'] -= df
-            prev = u
-
-    # removal of excess edges and nodes
-    for (u, v) in old_graph.edges():
-        graph.remove_edge(v, u)
-    for depot in get_depot_list(graph):
-        graph.remove_edge('s', depot)
-    graph.remove_node('s')
-    for client in get_client_list(graph):
-        graph.remove_edge(client, 't')
-    graph.remove_node('t')
-
-    return graph
-
-
-def solve(graph, max_time):
-    """Main solving function"""
+def initialize(problem, initial_flow='dinic', lower_bound=False, warm_flows=None, lazy=False):
+    """Defines an initial solution of maximum flow for the transshipment problem, as an expanded Network
+
+    problem is a networkx graph or an Instance. warm_flows are the flows of a previous solution, used instead of
+    initial_flow when they can be repaired. With lower_bound, a lower bound is kept in the network attributes."""
+
+    with timer('expand'):
+        network = expand_network(get_instance(problem), lazy)
+    initialize_network(network, initial_flow, lower_bound, warm_flows)
+
+    return network
+
+
+def initialize_network(network, initial_flow='dinic', lower_bound=False, warm_flows=None):
+    """Defines the initial solution of an expanded network, with its cost in its attributes (see initialize)"""
+
+    # whether the flow is a maximum flow of minimum cost for the linearized costs (see get_lower_bound)
+    solved = False
+    warm = False
+    with timer('initial_flow'):
+        try:
+            if warm_flows is not None or initial_flow == 'min_cost':
+                try:
+                    with limit_time(get_time_left() * INITIAL_FLOW_SHARE):
+                        warm = warm_flows is not None and warm_start(network, warm_flows)
+                        if not warm and initial_flow == 'min_cost':
+                            run_with_shortcuts(network, successive_shortest_paths)
+                            solved = True
+                except DeadlineReached:
+                    count('deadline_fallbacks')
+                    warm = False
+                    initial_flow = 'dinic'
+            if not warm and not solved:
+                run_with_shortcuts(network, INITIAL_FLOWS[initial_flow])
+        except DeadlineReached:
+            # there is no solution without a maximum flow
+            network.flow[:] = 0
+            network.attributes['interrupted'] = True
+    network.attributes['cost'] = network.get_cost()
+    network.attributes['warm_start'] = warm
+    if lower_bound:
+        with timer('lower_bound'), limit_time(get_time_left() * LOWER_BOUND_SHARE):
+            try:
+                network.attributes['lower_bound'] = get_lower_bound(network, solved)
+            except DeadlineReached:
+                count('deadline_fallbacks')
+
+
+def warm_start(network, flows):
+    """Sets the flow of a network from the flows of a previous solution and repairs it
+
+    flows give the flow of each edge by the labels of its nodes, as strings. Returns False if the flow can't meet
+    all demands."""
+
+    labels = [str(label) for label in network.labels]
+    network.flow[:] = [flows.get((labels[u], labels[v]), 0)
+                       for u, v in zip(network.tail.tolist(), network.head.tolist())]
+    fold_chains(network, flows)
+
+    return repair_flow(network)
+
 
+def get_solution_flows(network):
+    """Returns the flows of the used edges of a solution by the labels of their nodes, as used by warm_start"""
+
+    labels = network.labels
+    return dict(((str(labels[u]), str(labels[v])), flow) for u, v, flow in zip(
+        network.tail.tolist(), network.head.tolist(), network.flow.tolist()) if flow > 0)
+
+
+def solve(network, max_time, method='negative_cycle', seed=0, target_gap=None, checkpoint=None):
+    """Main solving function
+
+    method is a cycle search (see CYCLE_SEARCHES) or a metaheuristic (see METAHEURISTICS). The optimization ends at
+    max_time (in milliseconds), the deadline, the target_gap or a Ctrl-C, the network keeping the best solution."""
+
+    best = [(network.get_cost(), network.flow.copy())]
+    network.attributes['gap_reached'] = False
     try:
         u_time = time.time()
-        s_time = time.clock()
-
-        continual = True
-        while continual:
-            # while there is at least one negative cycle
-            continual = False
-            gap_graph = get_gap_graph(graph)
-            tmp_graph = graph.copy()
-            cycles = nx.simple_cycles(gap_graph)
-            for cycle in cycles:
-                # to end the optimization before the end, after a certain time
-                if time.time() - u_time >= max_time / 1000:
-                    raise KeyboardInterrupt
-
-                # for each cycle in the gap graph
-                if len(cycle) > 2:
-                    # if the cycle is not only between two nodes
-                    cycle = cycle + [cycle[0]]
-                    # adding the first node of the cycle at the end
-                    maxi = gap_graph.edge[cycle[0]][cycle[1]]['capacity']
-                    for i in range(1, len(cycle)):
-                        # computing the maximum flow we can change in the cycle
-                        maxi = min(maxi, gap_graph.edge[cycle[i - 1]][cycle[i]]['capacity'])
-
-                    cost = 0
-                    for i in range(1, len(cycle)):
-                        cost += gap_graph.edge[cycle[i - 1]][cycle[i]]['unit_cost'] * maxi
-                        # adding the unit cost of the edge
-                        if gap_graph[cycle[i - 1]][cycle[i]]['fixed_cost'] > 0:
-                            # if we increase the flow in a graph edge
-                            if tmp_graph[cycle[i - 1]][cycle[i]]['flow'] == 0:
-                                # if the edge was unused, we add the fixed cost
-                                cost += gap_graph.edge[cycle[i - 1]][cycle[i]]['fixed_cost']
-                        else:
-                            # if we decrease the flow in a graph edge
-                            if gap_graph.edge[cycle[i - 1]][cycle[i]]['capacity'] == maxi:
-                                # if we empty the edge in the base graph, we deduce the fixed cost
-                                cost += gap_graph.edge[cycle[i - 1]][cycle[i]]['fixed_cost']
-
-                    if cost < 0:
-                        continual = True
-                        # there is a negative cycle so we continue
-                        for i in range(1, len(cycle)):
-
-                            if tmp_graph.has_edge(cycle[i - 1], cycle[i]):
-                                # if the edge is in the same orientation in the graph and the gap graph
-                                tmp_graph.edge[cycle[i - 1]][cycle[i]]['flow'] += maxi
-                                # we add the flow
-                            else:
-                                # if the edge is in the opposite orientation in the graph and the gap graph
-                                tmp_graph.edge[cycle[i]][cycle[i - 1]]['flow'] -= maxi
-                                # we deduce the flow
-                        break
-            graph = tmp_graph
-            print('\n##############################')
-            print('# New better solution found! #')
-            print('##############################\n')
-            print_solution(graph)
-
-            u_tmp = time.time() - u_time
-            s_tmp = time.clock() - s_time
-
-            u_hour = (u_tmp - (u_tmp % 3600.)) / 3600
-            s_hour = (s_tmp - (s_tmp % 3600.)) / 3600
-
-            u_tmp -= u_hour * 3600.
-            s_tmp -= s_hour * 3600.
-
-            u_min = (u_tmp - (u_tmp % 60.)) / 60
-            s_min = (s_tmp - (s_tmp % 60.)) / 60
-
-            u_tmp -= u_min * 60.
-            s_tmp -= s_min * 60.
-
-            print('\nTime since beginning:')
-            print('\tUser time : {} hours, {} minutes and {} seconds'.format(u_hour, u_min, u_tmp))
-            print('\tSystem time : {} hours, {} minutes and {} seconds\n'.format(s_hour, s_min, s_tmp))
-
-        graph.graph['interrupted'] = False
-
+        s_time = time.process_time()
+        check_time(u_time, max_time)
+
+        with timer('residual_build'):
+            residual = ResidualGraph(network)
+
+        lower_bound = network.attributes.get('lower_bound')
+        best[0] = (residual.cost, network.flow.copy())
+        if checkpoint is not None:
+            checkpoint.start(network, lambda: best[0])
+        check_gap(residual.cost, lower_bound, target_gap)
+
+        def report():
+            # the current flow is the best one found
+            best[0] = (residual.cost, network.flow.copy())
+            record_cost(residual.cost)
+            print_improvement(network, residual.cost, u_time, s_time)
+            check_gap(residual.cost, lower_bound, target_gap)
+
+        with timer('cycle_search'), limit_time(max_time, u_time):
+            if method in METAHEURISTICS:
+                state = None if checkpoint is None else checkpoint.state
+                METAHEURISTICS[method](residual, u_time, max_time, report, seed, state=state)
+            else:
+                improve = CYCLE_SEARCHES[method]
+                while improve(residual, u_time, max_time):
+                    # while there is at least one negative cycle
+                    report()
+
+        network.attributes['interrupted'] = False
+
+    except TargetGapReached:
+        print_target_gap()
+        network.attributes['interrupted'] = False
+        network.attributes['gap_reached'] = True
+    except DeadlineReached:
+        print_deadline()
+        network.attributes['interrupted'] = True
     except KeyboardInterrupt:
-        print('Optimization interrupted!', file=sys.stderr)
-        graph.graph['interrupted'] = True
+        print_interruption()
+        network.attributes['interrupted'] = True
+        network.attributes['cancelled'] = True
     finally:
-        return graph
+        if checkpoint is not None:
+            checkpoint.stop()
+        network.attributes['cost'], network.flow[:] = best[0]
+        return network
+
+
+def get_lower_bound(network, solved=False):
+    """Computes a lower bound of the cost of all solutions (linear relaxation)
+
+    With each fixed cost spread over the capacity of its edge, a maximum flow of minimum cost costs at most any
+    solution. solved tells that the flow of the network already is such a flow, which is kept."""
+
+    flow = network.flow.copy()
+    try:
+        if not solved:
+            run_with_shortcuts(network, successive_shortest_paths)
+        lower_bound = float(np.dot(network.flow, get_linearized_unit_costs(network)))
+    finally:
+        network.flow[:] = flow
+
+    excess = (np.bincount(network.head, flow, network.nbr_nodes)
+              - np.bincount(network.tail, flow, network.nbr_nodes))
+    if np.abs(excess - network.demand).max(initial=0.) <= EPSILON:
+        lower_bound = min(lower_bound, network.get_cost())
+
+    return lower_bound
+
+
+def get_gap(cost, lower_bound):
+    """Computes the relative gap between the cost of a solution and a lower bound"""
+
+    if cost <= EPSILON:
+        return 0.
+    return max(cost - lower_bound, 0.) / cost
+
+
+def check_gap(cost, lower_bound, target_gap):
+    """Ends the optimization when the gap of a solution is at most target_gap (if there is a lower bound)"""
+
+    if target_gap is not None and lower_bound is not None and get_gap(cost, lower_bound) <= target_gap:
+        raise TargetGapReached
+
+
+def check_time(u_time, max_time):
+    """Ends the optimization when the time limit (in milliseconds) or the deadline of the resolution is reached"""
+
+    if time.time() - u_time >= max_time / 1000:
+        raise DeadlineReached
+    check_deadline()
+
+
+def try_cycle(residual, cycle):
+    """Pushes as much flow as possible along a cycle of arcs, the push is undone if it doesn't improve the cost"""
+
+    count('cycles_examined')
+    delta = residual.push(cycle, residual.get_cycle_capacity(cycle))
+    if delta < -EPSILON:
+        residual.commit()
+        count('cycles_applied')
+        return True
+
+    residual.undo()
+    return False
+
+
+def cancel_enumerated_cycle(residual, u_time, max_time):
+    """Applies the first improving cycle found by enumerating all elementary cycles of the gap graph"""
+
+    check_time(u_time, max_time)
+    gap_graph = residual.get_gap_graph()
+    for cycle in nx.simple_cycles(gap_graph):
+        # to end the optimization before the end, after a certain time
+        check_time(u_time, max_time)
+
+        # for each cycle in the gap graph
+        if len(cycle) > 2:
+            # if the cycle is not only between two nodes
+            cycle = cycle + [cycle[0]]
+            # adding the first node of the cycle at the end
+            arcs = [gap_graph.edge[cycle[i - 1]][cycle[i]]['arc'] for i in range(1, len(cycle))]
+            if try_cycle(residual, arcs):
+                return True
+
+    return False
+
+
+def cancel_negative_cycle(residual, u_time, max_time):
+    """Applies an improving cycle found with Bellman-Ford negative cycle detection (cycle canceling)
+
+    The gap graph is searched with linearized fixed costs, then opening costs and finally unit costs, each cycle
+    being kept only if its real cost change improves the solution."""
+
+    for weight in (get_linearized_costs, get_opening_costs, get_unit_costs):
+        cycle = get_bellman_ford_cycle(residual, weight, u_time, max_time)
+        if cycle is not None and try_cycle(residual, cycle):
+            return True
+
+    return False
+
+
+def get_bellman_ford_cycle(residual, weight, u_time, max_time):
+    """Finds a negative cycle of arcs in the gap graph for the given weight function, if any
+
+    All arcs are relaxed at once in each pass, from the distances of the previous pass (see relax_arcs)."""
+
+    arcs = np.flatnonzero(residual.get_capacities() > 0)
+    tail = residual.tail[arcs]
+    head = residual.head[arcs]
+    weights = weight(residual)[arcs]
+
+    # every node starts at distance 0, as if linked to a virtual source
+    dist = np.zeros(residual.network.nbr_nodes)
+    pred = np.full(residual.network.nbr_nodes, -1, dtype=np.int64)
+    for _ in range(residual.network.nbr_nodes):
+        check_time(u_time, max_time)
+        count('bellman_ford_passes')
+
+        if not relax_arcs(dist, pred, arcs, tail, head, weights):
+            # distances are stable, there is no negative cycle
+            return None
+
+        # any cycle of the predecessor graph is a negative cycle
+        cycle = get_pred_cycle(residual, pred)
+        if cycle is not None:
+            return cycle
+
+    return None
+
+
+def get_pred_cycle(residual, pred):
+    """Looks for a cycle in an array of predecessor arcs, returned in the direction of the arcs"""
+
+    pred_node = np.where(pred >= 0, residual.tail[pred], -1).tolist()
+    pred = pred.tolist()
+
+    visited = [-1] * len(pred)
+    for start in range(len(pred)):
+        u = start
+        while pred_node[u] >= 0 and visited[u] < 0:
+            visited[u] = start
+            u = pred_node[u]
+        if visited[u] == start:
+            # u was reached twice from the same start, so it is on a cycle
+            cycle = [pred[u]]
+            v = pred_node[u]
+            while v != u:
+                cycle.append(pred[v])
+                v = pred_node[v]
+            cycle.reverse()
+            return cycle
+
+    return None
+
+
+def get_unit_costs(residual):
+    """Weights of all arcs counting only unit costs"""
+
+    return residual.get_unit_costs()
+
+
+def get_linearized_costs(residual):
+    """Weights of all arcs with the fixed cost spread over the flow (or capacity if unused)"""
+
+    network = residual.network
+    used = np.where(network.flow > 0, network.flow, network.capacity)
+    slopes = network.unit_cost + network.fixed_cost / used
+
+    weights = np.empty(2 * network.nbr_edges)
+    weights[0::2] = slopes
+    weights[1::2] = -slopes
+
+    return weights
+
+
+def get_opening_costs(residual):
+    """Weights of all arcs where only opening an unused edge pays for its fixed cost"""
+
+    network = residual.network
+    weights = residual.get_unit_costs()
+    weights[0::2] += np.where(network.flow == 0, network.fixed_cost / network.capacity, 0.)
+
+    return weights
+
+
+def slope_scaling(residual, u_time, max_time, report, seed=0, incumbent=None, state=None):
+    """Searches the best solution until the time limit (Dynamic Slope Scaling metaheuristic)
+
+    report is called for each best flow. incumbent, if given, returns the best solution of other searches, and
+    state, if given, keeps the slopes, seen costs and random generator of the search (see Checkpoint)."""
+
+    network = residual.network
+    rng = get_random_generator(seed, state)
+    best_cost = residual.cost
+    seen_costs = set()
+    slopes = get_linearized_unit_costs(network)
+    if state is not None and len(state.get('slopes', ())) == network.nbr_edges:
+        slopes = np.array(state['slopes'], dtype=float)
+        seen_costs = set(np.asarray(state['seen_costs']).tolist())
+
+    while True:
+        check_time(u_time, max_time)
+        count('slope_scaling_iterations')
+
+        network.flow[:] = 0
+        successive_shortest_paths(network, slopes)
+        residual.reset()
+        while cancel_negative_cycle(residual, u_time, max_time):
+            pass
+
+        cost = residual.cost
+        if cost < best_cost - EPSILON:
+            best_cost = cost
+            report()
+
+        used = network.flow > 0
+        slopes = np.where(used, network.unit_cost + network.fixed_cost / np.maximum(network.flow, 1), slopes)
+        if round(cost, 6) in seen_costs:
+            if incumbent is not None:
+                incumbent_cost, incumbent_flow = incumbent()
+                if incumbent_cost < best_cost - EPSILON:
+                    slopes = np.where(incumbent_flow > 0, network.unit_cost + network.fixed_cost /
+                                      np.maximum(incumbent_flow, 1), slopes)
+            slopes *= rng.uniform(1 - SLOPE_PERTURBATION, 1 + SLOPE_PERTURBATION, len(slopes))
+        seen_costs.add(round(cost, 6))
+        if state is not None:
+            state.update(slopes=slopes, seen_costs=np.array(sorted(seen_costs)), rng=rng.bit_generator.state)
+
+
+def large_neighborhood_search(residual, u_time, max_time, report, seed=0, incumbent=None, state=None):
+    """Searches the best solution until the time limit by closing and rerouting parts of the solution
+
+    report is called for each best flow. incumbent, if given, returns the best solution of other searches, and
+    state, if given, keeps the random generator and failures of the search (see Checkpoint)."""
+
+    network = residual.network
+    rng = get_random_generator(seed, state)
+    groups = get_platform_edges_groups(network)
+    failures = 0 if state is None else state.get('failures', 0)
+
+    while True:
+        check_time(u_time, max_time)
+        count('lns_moves')
+        if state is not None:
+            state.update(failures=failures, rng=rng.bit_generator.state)
+
+        used = network.flow > 0
+        used_groups = [edges for edges in groups if used[edges].any()]
+        if used_groups and rng.random() < 0.5:
+            closed = used_groups[rng.integers(len(used_groups))]
+        else:
+            candidates = np.flatnonzero(used & (network.fixed_cost > 0))
+            if len(candidates) == 0:
+                return
+            closed = rng.choice(candidates, min(rng.integers(1, 4), len(candidates)), replace=False)
+
+        excess = np.zeros(network.nbr_nodes, dtype=np.int64)
+        for e in closed[used[closed]].tolist():
+            amount = int(network.flow[e])
+            residual.push([2 * e + 1], amount)
+            excess[network.tail[e]] += amount
+            excess[network.head[e]] -= amount
+
+        if reroute(residual, excess, closed, u_time, max_time) and residual.pending < -EPSILON:
+            residual.commit()
+            count('lns_improvements')
+            failures = 0
+            report()
+            continue
+
+        residual.undo()
+        failures += 1
+        if incumbent is not None and failures >= LNS_RESTART:
+            failures = 0
+            incumbent_cost, incumbent_flow = incumbent()
+            if incumbent_cost < residual.cost - EPSILON:
+                network.flow[:] = incumbent_flow
+                residual.reset()
+
+
+def get_random_generator(seed, state=None):
+    """Returns the random generator of a metaheuristic, from the state of a previous search if there is one"""
+
+    rng = np.random.default_rng(seed)
+    if state is not None and 'rng' in state:
+        rng.bit_generator.state = state['rng']
+
+    return rng
+
+
+def reroute(residual, excess, closed, u_time, max_time):
+    """Sends the excess of the nodes with too much flow to the nodes missing some, without the closed edges
+
+    Arcs adding flow to an unused edge also pay its fixed cost spread over the flow to reroute. Returns False if
+    some excess can't be sent."""
+
+    network = residual.network
+    allowed = np.ones(2 * network.nbr_edges, dtype=bool)
+    allowed[2 * np.asarray(closed)] = False
+
+    while (excess > 0).any():
+        count('lns_shortest_paths')
+        arcs = np.flatnonzero((residual.get_capacities() > 0) & allowed)
+        tail = residual.tail[arcs]
+        head = residual.head[arcs]
+        weights = np.zeros(2 * network.nbr_edges)
+        weights[0::2] = network.unit_cost + np.where(network.flow == 0, network.fixed_cost /
+                                                     np.maximum(np.minimum(network.capacity,
+                                                                           excess[excess > 0].sum()), 1), 0.)
+        weights = weights[arcs]
+
+        dist = np.where(excess > 0, 0., np.inf)
+        pred = np.full(network.nbr_nodes, -1, dtype=np.int64)
+        check_time(u_time, max_time)
+        while relax_arcs(dist, pred, arcs, tail, head, weights):
+            check_time(u_time, max_time)
+
+        deficit = np.flatnonzero((excess < 0) & (dist < np.inf))
+        if len(deficit) == 0:
+            return False
+
+        for v in deficit[np.argsort(dist[deficit], kind='stable')].tolist():
+            path = []
+            u = v
+            while pred[u] >= 0 and len(path) <= network.nbr_nodes:
+                path.append(int(pred[u]))
+                u = residual.tail[pred[u]]
+            path.reverse()
+            amount = min(excess[u], -excess[v], residual.get_cycle_capacity(path))
+            if amount > 0:
+                residual.push(path, amount)
+                excess[u] -= amount
+                excess[v] += amount
+
+    return True
+
+
+def get_platform_edges_groups(network):
+    """Groups the depot to platform and platform to client edges of an expanded network by platform
+
+    The platform of these edges is read from the labels of their DP and CP nodes (see expand_network)."""
+
+    groups = dict()
+    for e, (u, v) in enumerate(zip(network.tail.tolist(), network.head.tolist())):
+        for label in (network.labels[v], network.labels[u]):
+            if isinstance(label, str) and label[:2] in ('DP', 'CP') and network.fixed_cost[e] > 0:
+                groups.setdefault(label.split('-')[1], []).append(e)
+                break
+
+    return [np.array(edges, dtype=np.int64) for edges in groups.values()]
+
+
+INITIAL_FLOWS = {
+    'dinic': dinic,
+    'edmonds_karp': edmonds_karp,
+    'min_cost': successive_shortest_paths
+}
+
+CYCLE_SEARCHES = {
+    'enumeration': cancel_enumerated_cycle,
+    'negative_cycle': cancel_negative_cycle
+}
+
+METAHEURISTICS = {
+    'lns': large_neighborhood_search,
+    'slope_scaling': slope_scaling
+}
 
 
 def get_depot_list(graph):
@@ -207,92 +563,177 @@ def get_client_list(graph):
     return client_list
 
 
-def get_gap_graph(graph):
-    """Details platforms with new nodes and edges"""
-
-    gap_graph = nx.DiGraph()
-    gap_graph.add_nodes_from(graph)
-    for u, v in graph.edges_iter():
-        if u != v:
-            if graph.edge[u][v]['flow'] < graph.edge[u][v]['capacity']:
-                gap_graph.add_edge(u, v,
-                                   capacity=graph.edge[u][v]['capacity'] - graph.edge[u][v]['flow'],
-                                   fixed_cost=graph.edge[u][v]['fixed_cost'], unit_cost=graph.edge[u][v]['unit_cost'])
-
-            if graph.edge[u][v]['flow'] > 0:
-                gap_graph.add_edge(v, u, capacity=graph.edge[u][v]['flow'],
-                                   fixed_cost=-graph.edge[u][v]['fixed_cost'], unit_cost=-graph.edge[u][v]['unit_cost'])
-
-    return gap_graph
-
-
-def print_solution(graph):
-    """Displays all info about the solution of the problem"""
-
-    cost = 0
-
-    print()
-    for u, v in graph.edges_iter():
-        if graph.edge[u][v]['flow'] > 0:
-            cost += graph.edge[u][v]['flow'] * graph.edge[u][v]['unit_cost'] + graph.edge[u][v]['fixed_cost']
-            print('Edge #{} from node #{} to node #{} used with flow={}'.format(graph.edge[u][v]['id'], u, v,
-                                                                                graph.edge[u][v]['flow']))
-    print('\nResult: {}'.format(cost))
-
-
-def test_feasibility(graph):
+def test_feasibility(network):
     """Checks if a problem can or not be solved"""
 
-    feasible = True
+    depots = network.get_depots()
+    sum_flow = np.bincount(network.tail, network.flow, network.nbr_nodes)[depots]
+    feasible = bool(np.array_equal(sum_flow, -network.demand[depots]))
 
-    for i in get_depot_list(graph):
-        sum_flow = 0
-        for j in graph.successors(i):
-            sum_flow += graph.edge[i][j]['flow']
-        if sum_flow != -graph.node[i]['demand']:
-            feasible = False
-            break
-
-    graph.graph['feasible'] = feasible
+    network.attributes['feasible'] = feasible
     return feasible
 
 
 def expand(graph):
     """Change the graph to take care of time constraints"""
-    tmp_graph = nx.DiGraph()
-    for depot in get_depot_list(graph):
-        # for each depot we create a platform and its edge to it
-        tmp_graph.add_node(depot, demand=graph.node[depot]['demand'])
-        for platform in get_platform_list(graph):
-            if graph.has_edge(depot, platform):
-                tmp_graph.add_node('DP' + str(depot) + str(platform), demand=0)
-                edge = graph.edge[depot][platform]
-                tmp_graph.add_edge(depot, 'DP' + str(depot) + str(platform), id=edge['id'],
-                                   capacity=edge['capacity'], fixed_cost=edge['fixed_cost'],
-                                   unit_cost=edge['unit_cost'], flow=0)
-    for client in get_client_list(graph):
-        tmp_graph.add_node(client, demand=graph.node[client]['demand'])
-        for platform in get_platform_list(graph):
-            # like for the depots
-            if graph.has_edge(platform, client):
-                tmp_graph.add_node('CP' + str(client) + str(platform), demand=0)
-                edge = graph.edge[platform][client]
-                tmp_graph.add_edge('CP' + str(client) + str(platform), client, id=edge['id'],
-                                   capacity=edge['capacity'], fixed_cost=edge['fixed_cost'],
-                                   unit_cost=edge['unit_cost'], flow=0)
-                for depot in get_depot_list(graph):
-                    # if we can go from a depot to a client through a platform, the edge is created
-                        if tmp_graph.has_node('DP' + str(depot) + str(platform)):
-                            t = graph.edge[depot][platform]['time']
-                            t += graph.node[platform]['time']
-                            t += graph.edge[platform][client]['time']
-                            if t <= graph.graph['time']:
-                                tmp_graph.add_edge('DP' + str(depot) + str(platform),
-                                                   'CP' + str(client) + str(platform),
-                                                   id=str(depot) + str(platform) + str(client),
-                                                   capacity=min(graph.edge[depot][platform]['capacity'],
-                                                                graph.edge[platform][client]['capacity']),
-                                                   fixed_cost=0, unit_cost=graph.node[platform]['unit_cost'], flow=0)
-    tmp_graph.graph['interrupted'] = False
-    graph = tmp_graph
-    return graph
+
+    return expand_network(get_instance(graph)).to_graph()
+
+
+def get_instance(graph):
+    """Returns the instance of a problem given as a networkx graph or as an Instance"""
+
+    if isinstance(graph, Instance):
+        return graph
+    return Instance.from_graph(graph)
+
+
+def expand_network(instance, lazy=False):
+    """Builds the network of an instance taking care of time constraints
+
+    Each DP node is linked to the CP nodes of its platform it can be chained with in time (see get_chains). With
+    lazy, each platform gets a ladder standing for all its chains instead (see get_ladders)."""
+
+    nodes = instance.node_ids.tolist()
+    node_labels = instance.node_ids
+    node_demand = instance.demand
+    node_unit_cost = instance.node_unit_cost
+    edge_ids = instance.edge_ids.tolist()
+    capacity = instance.capacity
+    fixed_cost = instance.fixed_cost
+    unit_cost = instance.unit_cost
+
+    if lazy:
+        tail, head, dp, cp = get_platform_edges(instance)
+    else:
+        tail, head, dp, cp, first, second = get_chains(instance)
+    dp_platform = head[dp]
+
+    depots = np.flatnonzero(node_demand < 0)
+    clients = np.flatnonzero(node_demand > 0)
+
+    # nodes of the network: depots, DP nodes, clients and CP nodes
+    new_index = np.full(len(nodes), -1, dtype=np.int64)
+    new_index[depots] = np.arange(len(depots))
+    new_index[clients] = len(depots) + len(dp) + np.arange(len(clients))
+    dp_nodes = len(depots) + np.arange(len(dp))
+    cp_nodes = len(depots) + len(dp) + len(clients) + np.arange(len(cp))
+
+    labels = [nodes[i] for i in depots.tolist()]
+    labels += get_edge_node_labels('DP', [nodes[u] for u in tail[dp].tolist()], [nodes[v] for v in head[dp].tolist()],
+                                   [edge_ids[e] for e in dp.tolist()])
+    labels += [nodes[i] for i in clients.tolist()]
+    labels += get_edge_node_labels('CP', [nodes[v] for v in head[cp].tolist()], [nodes[u] for u in tail[cp].tolist()],
+                                   [edge_ids[e] for e in cp.tolist()])
+
+    if lazy:
+        return expand_ladders(instance, labels, new_index, tail, head, dp, cp, dp_nodes, cp_nodes)
+
+    chain_ids = np.stack((node_labels[tail[dp[first]]], node_labels[dp_platform[first]],
+                          node_labels[head[cp[second]]]), axis=1)
+
+    return Network(labels,
+                   np.concatenate((node_demand[depots], np.zeros(len(dp)), node_demand[clients], np.zeros(len(cp)))),
+                   np.concatenate((new_index[tail[dp]], cp_nodes, dp_nodes[first])),
+                   np.concatenate((dp_nodes, new_index[head[cp]], cp_nodes[second])),
+                   CompositeIds([edge_ids[e] for e in dp.tolist()] + [edge_ids[e] for e in cp.tolist()], chain_ids),
+                   np.concatenate((capacity[dp], capacity[cp], np.minimum(capacity[dp[first]], capacity[cp[second]]))),
+                   np.concatenate((fixed_cost[dp], fixed_cost[cp], np.zeros(len(first)))),
+                   np.concatenate((unit_cost[dp], unit_cost[cp], node_unit_cost[dp_platform[first]])),
+                   {'interrupted': False})
+
+
+def get_edge_node_labels(prefix, ends, platforms, edge_ids):
+    """Labels the nodes standing for edges as [prefix][end]-[platform]
+
+    Parallel edges, between the same end and platform, would get the same label, so the id of the edge is
+    appended to their labels: [prefix][end]-[platform]-[edge id]."""
+
+    labels = ['{}{}-{}'.format(prefix, end, platform) for end, platform in zip(ends, platforms)]
+    counts = collections.Counter(labels)
+
+    return [label if counts[label] == 1 else '{}-{}'.format(label, edge_id)
+            for label, edge_id in zip(labels, edge_ids)]
+
+
+def expand_ladders(instance, labels, new_index, tail, head, dp, cp, dp_nodes, cp_nodes):
+    """Builds the network of an instance with a ladder of nodes for the chains of each platform (see
+    expand_network), from its labels and the indices of its nodes"""
+
+    nodes = instance.node_ids.tolist()
+    node_demand = instance.demand
+    edge_ids = instance.edge_ids.tolist()
+    capacity = instance.capacity
+
+    level_platform, level_rank, level_cp, entry_dp, entry_level, step = get_ladders(instance, tail, head, dp, cp)
+    level_nodes = len(labels) + np.arange(len(level_cp))
+    labels = labels + ['L{}-{}'.format(nodes[p], rank + 1)
+                       for p, rank in zip(level_platform.tolist(), level_rank.tolist())]
+
+    # the steps of a ladder can carry all the flow entering it
+    entering = np.bincount(level_platform[entry_level], weights=capacity[dp[entry_dp]], minlength=len(nodes))
+
+    edge_tail = np.concatenate((new_index[tail[dp]], cp_nodes, dp_nodes[entry_dp], level_nodes[step],
+                                level_nodes))
+    edge_head = np.concatenate((dp_nodes, new_index[head[cp]], level_nodes[entry_level], level_nodes[step - 1],
+                                cp_nodes[level_cp]))
+    ladder_ids = ['{}-{}'.format(labels[u], labels[v]) for u, v in zip(edge_tail[len(dp) + len(cp):].tolist(),
+                                                                        edge_head[len(dp) + len(cp):].tolist())]
+    nbr_ladder_edges = len(ladder_ids)
+
+    return Network(labels,
+                   np.concatenate((node_demand[node_demand < 0], np.zeros(len(dp)), node_demand[node_demand > 0],
+                                   np.zeros(len(cp) + len(level_cp)))),
+                   edge_tail, edge_head,
+                   [edge_ids[e] for e in dp.tolist()] + [edge_ids[e] for e in cp.tolist()] + ladder_ids,
+                   np.concatenate((capacity[dp], capacity[cp], capacity[dp[entry_dp]],
+                                   entering[level_platform[step]], capacity[cp[level_cp]])),
+                   np.concatenate((instance.fixed_cost[dp], instance.fixed_cost[cp], np.zeros(nbr_ladder_edges))),
+                   np.concatenate((instance.unit_cost[dp], instance.unit_cost[cp],
+                                   instance.node_unit_cost[head[dp[entry_dp]]],
+                                   np.zeros(len(step) + len(level_cp)))),
+                   {'interrupted': False})
+
+
+def get_chains(instance):
+    """Lists the chains from a depot to a client through a platform within the time limit of an instance
+
+    Returns the node indices of the tail and head of each edge, the DP edges (dp), the CP edges (cp) and the
+    chains, made of the edges dp[first[k]] and cp[second[k]]."""
+
+    node_demand = instance.demand
+    node_time = instance.node_time
+    edge_time = instance.edge_time
+    tail, head, dp, cp = get_platform_edges(instance)
+
+    # the pairs are (first[k], second[k])
+    dp_platform = head[dp]
+    cp_order = np.argsort(tail[cp], kind='stable')
+    cp_count = np.bincount(tail[cp], minlength=len(node_demand))
+    cp_start = np.cumsum(cp_count) - cp_count
+    counts = cp_count[dp_platform]
+    first = np.repeat(np.arange(len(dp)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = cp_order[np.repeat(cp_start[dp_platform], counts) + offsets]
+
+    # only the chains within the time limit are kept
+    chain_time = edge_time[dp[first]] + node_time[dp_platform[first]] + edge_time[cp[second]]
+    feasible = chain_time <= instance.attributes['time']
+
+    return tail, head, dp, cp, first[feasible], second[feasible]
+
+
+def get_platform_edges(instance):
+    """Returns the node indices of the tail and head of each edge of an instance, and the depot to platform
+    (dp) and platform to client (cp) edges, the only ones taken into account"""
+
+    # edges refer to node ids, they are turned into node indices
+    order = np.argsort(instance.node_ids, kind='stable')
+    tail = order[np.searchsorted(instance.node_ids, instance.tail, sorter=order)]
+    head = order[np.searchsorted(instance.node_ids, instance.head, sorter=order)]
+
+    is_platform = instance.demand == 0
+    dp = np.flatnonzero((instance.demand[tail] < 0) & is_platform[head])
+    cp = np.flatnonzero(is_platform[tail] & (instance.demand[head] > 0))
+
+    return tail, head, dp, cp
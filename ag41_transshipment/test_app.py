@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_app.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the resolution of problem files of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.app import Application, solve_all
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.parser import export_instance, export_summary, get_problem_files
+from ag41_transshipment.test_parser import PROBLEM
+import json
+import os
+import pytest
+import time
+
+# time allowed past the deadline for the parsing, the expansion and the export, in seconds
+DEADLINE_MARGIN = 0.5
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+@pytest.mark.parametrize('max_time', [100, 500])
+def test_resolution_within_deadline(tmp_path, lazy, max_time):
+    file_name = str(tmp_path / 'problem.txt')
+    export_instance(generate_instance(8, 40, 300, seed=1), file_name)
+
+    u_time = time.time()
+    Application(file_name, max_time, lazy=lazy)
+
+    assert time.time() - u_time <= max_time / 1000 + DEADLINE_MARGIN
+
+
+@pytest.mark.parametrize('solution_format', ['text', 'jsonl'])
+def test_target_gap_reached(tmp_path, solution_format):
+    file_name = str(tmp_path / 'problem.txt')
+    export_instance(generate_instance(2, 4, 8, seed=3), file_name)
+
+    # any solution is within 100% of the lower bound
+    app = Application(file_name, 5000, target_gap=1., solution_format=solution_format)
+
+    if solution_format == 'text':
+        with open(file_name + '.sol') as file:
+            text = file.read()
+        assert '# TARGET GAP REACHED #' in text and '# OPTIMAL SOLUTION #' not in text
+    else:
+        with open(file_name + '.sol.jsonl') as file:
+            result = json.loads(file.readline())
+        assert result['status'] == 'target_gap'
+        assert result['gap'] == pytest.approx(app.gap)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_solve_all(tmp_path, workers):
+    (tmp_path / 'a.txt').write_bytes(PROBLEM)
+    (tmp_path / 'b.txt').write_bytes(PROBLEM.replace(b'NODE: 1', b'NODE 1'))
+    (tmp_path / 'c.txt').write_bytes(PROBLEM)
+    (tmp_path / 'c.txt.sol').write_text('solution')
+    (tmp_path / 'scenarios.csv').write_text('scenario,5,6\n')
+    (tmp_path / 'cache').mkdir()
+    summary_path = str(tmp_path / 'summary.txt')
+    export_summary([], summary_path)
+
+    # the solutions, the summary and the other data files aren't problems
+    file_names = get_problem_files(str(tmp_path), [summary_path])
+    assert [os.path.basename(file_name) for file_name in file_names] == ['a.txt', 'b.txt', 'c.txt']
+
+    # the syntax error of b.txt doesn't stop the other problems
+    summaries = solve_all(file_names, 500, workers=workers)
+    assert [summary['instance'] for summary in summaries] == ['a.txt', 'b.txt', 'c.txt']
+    assert summaries[0]['feasible'] and summaries[2]['feasible']
+    assert summaries[1]['best_cost'] is None and summaries[1]['error'].startswith('SyntaxError')
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_checkpoint.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the checkpoints of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.app import Application
+from ag41_transshipment.checkpoint import Checkpoint, load_checkpoint
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.parser import Parser, export_instance
+from ag41_transshipment.solver import initialize, solve
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+def save_search(file_path, content_hash, instance):
+    """Runs a search on an instance with a checkpoint, returns the checkpoint and the network"""
+
+    checkpoint = Checkpoint(file_path, content_hash, interval=3600.)
+    network = solve(initialize(instance), 300, 'slope_scaling', checkpoint=checkpoint)
+
+    return checkpoint, network
+
+
+def test_checkpoint_keeps_the_search_state(tmp_path):
+    file_path = str(tmp_path / 'problem.txt.sol.ckpt.npz')
+    checkpoint, network = save_search(file_path, 'hash', generate_instance(2, 4, 8, seed=3))
+    state = load_checkpoint(file_path, 'hash')
+
+    assert load_checkpoint(file_path, 'other hash') is None
+    assert state['cost'] == pytest.approx(network.attributes['cost'])
+    assert state['flows'] == dict(((str(network.labels[u]), str(network.labels[v])), flow) for u, v, flow in zip(
+        network.tail.tolist(), network.head.tolist(), network.flow.tolist()) if flow > 0)
+    assert np.array_equal(state['state']['slopes'], checkpoint.state['slopes'])
+    assert np.array_equal(state['state']['seen_costs'], checkpoint.state['seen_costs'])
+    assert state['state']['rng'] == checkpoint.state['rng']
+
+
+def test_resume_from_checkpoint(tmp_path):
+    file_name = str(tmp_path / 'problem.txt')
+    instance = generate_instance(2, 4, 8, seed=3)
+    export_instance(instance, file_name)
+    parser = Parser(file_name)
+    save_search(parser.get_checkpoint_path(), parser.get_content_hash(), instance)
+    state = load_checkpoint(parser.get_checkpoint_path(), parser.get_content_hash())
+
+    app = Application(file_name, 1000, 'slope_scaling', resume=True)
+
+    # the search goes on from the saved solution and slopes, the costs seen before aren't forgotten
+    assert app.cost <= state['cost'] + 1e-6
+    assert set(state['state']['seen_costs'].tolist()) <= set(app.checkpoint.state['seen_costs'].tolist())
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_decomposition.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the decomposition into independent parts of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.checkpoint import Checkpoint
+from ag41_transshipment.decomposition import solve_components
+from ag41_transshipment.metrics import get_metrics, reset_metrics
+from ag41_transshipment.parser import parse_lines
+from ag41_transshipment.solver import initialize, solve
+from ag41_transshipment.test_parser import PROBLEM
+from ag41_transshipment.test_solver import meets_demands
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+def get_twin_problem():
+    """Returns an instance made of PROBLEM twice, the nodes and edges of the second copy shifted by 6 and 9"""
+
+    lines = []
+    for line in PROBLEM.splitlines():
+        values = line.split()
+        if values[0] == b'NODE:':
+            lines.append(b' '.join([values[0], str(int(values[1]) + 6).encode()] + values[2:]))
+        elif values[0] == b'EDGE:':
+            lines.append(b' '.join([values[0]] + [str(int(value) + shift).encode() for value, shift in
+                                                  zip(values[1:4], (9, 6, 6))] + values[4:]))
+    lines = [line + b'\n' for line in PROBLEM.splitlines()[:-1] + lines + [b'EOF']]
+
+    return parse_lines(iter(lines), 'twin')
+
+
+def get_problem_cost():
+    """Returns the cost of the solution of PROBLEM alone"""
+
+    return solve(initialize(parse_lines(iter(PROBLEM.splitlines(True)), 'small')), 5000).attributes['cost']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_solve_components(workers):
+    reset_metrics()
+    network = initialize(get_twin_problem())
+    initial_cost = network.attributes['cost']
+    network = solve_components(network, 5000, workers)
+
+    assert get_metrics().counters['components'] == 2
+    assert network.attributes['cost'] <= initial_cost
+    assert network.attributes['cost'] == pytest.approx(network.get_cost())
+    assert not network.attributes['interrupted']
+    assert meets_demands(network)
+    # each part is solved as PROBLEM alone
+    assert network.attributes['cost'] == pytest.approx(2 * get_problem_cost())
+
+
+def test_components_with_checkpoint_are_solved_as_a_whole(tmp_path):
+    reset_metrics()
+    network = initialize(get_twin_problem())
+    checkpoint = Checkpoint(str(tmp_path / 'twin.sol.ckpt.npz'), 'hash', interval=3600.)
+    network = solve_components(network, 5000, checkpoint=checkpoint)
+
+    assert 'components' not in get_metrics().counters
+    assert meets_demands(network)
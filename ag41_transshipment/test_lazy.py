@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_lazy.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the lazy expansion of the transshipment solver project"""
+
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.lazy import run_with_shortcuts, unfold_chains
+from ag41_transshipment.mincost import get_linearized_unit_costs, successive_shortest_paths
+from ag41_transshipment.solver import INITIAL_FLOWS, expand_network, get_solution_flows, initialize, solve, \
+    warm_start
+from ag41_transshipment.test_solver import get_chain_labels, meets_demands
+import numpy as np
+import pytest
+
+
+def get_instance():
+    """Returns a generated instance with a tight time limit, so only some chains exist"""
+
+    return generate_instance(3, 5, 20, seed=6, time_limit=60.)
+
+
+def test_ladders_stand_for_the_chains():
+    # with the same linearized costs, a minimum cost flow costs the same through the ladders or the chains
+    costs = []
+    for lazy in (False, True):
+        network = successive_shortest_paths(expand_network(get_instance(), lazy))
+        costs.append(float(np.dot(network.flow, get_linearized_unit_costs(network))))
+
+    assert costs[0] == pytest.approx(costs[1])
+
+
+@pytest.mark.parametrize('initial_flow', sorted(INITIAL_FLOWS))
+def test_shortcuts_down_the_ladders(initial_flow):
+    # the flow of the shortcuts goes down the steps they skip, without changing the cost
+    costs = []
+    for lazy in (False, True):
+        network = run_with_shortcuts(expand_network(get_instance(), lazy), INITIAL_FLOWS[initial_flow])
+        assert meets_demands(network)
+        assert (network.flow <= network.capacity).all()
+        costs.append(float(np.dot(network.flow, get_linearized_unit_costs(network))))
+
+    if initial_flow == 'min_cost':
+        assert costs[0] == pytest.approx(costs[1])
+
+
+def test_unfold_chains():
+    network = expand_network(get_instance(), lazy=True)
+    successive_shortest_paths(network)
+    unfolded = unfold_chains(network)
+    chains = set(get_chain_labels(expand_network(get_instance())))
+
+    assert meets_demands(unfolded)
+    assert unfolded.get_cost() == pytest.approx(network.get_cost())
+    # every unfolded chain exists in the full expansion, with the same id
+    assert set(get_chain_labels(unfolded)) <= chains
+    assert not any(str(label).startswith('L') for label in unfolded.labels)
+    for u, v, edge_id in zip(unfolded.tail.tolist(), unfolded.head.tolist(), unfolded.edge_ids):
+        if str(unfolded.labels[u]).startswith('DP') and str(unfolded.labels[v]).startswith('CP'):
+            assert edge_id == '{}-{}'.format(unfolded.labels[u][2:], unfolded.labels[v][2:].split('-')[0])
+
+
+def test_unfold_chains_after_search():
+    network = solve(initialize(get_instance(), lazy=True), 500)
+    unfolded = unfold_chains(network)
+
+    assert meets_demands(unfolded)
+    assert unfolded.get_cost() == pytest.approx(network.attributes['cost'])
+
+
+def test_warm_start_from_chains():
+    # a solution with all chains, as written in a solution file, starts a lazily expanded resolution
+    solution = solve(initialize(get_instance()), 500)
+    network = expand_network(get_instance(), lazy=True)
+
+    assert warm_start(network, get_solution_flows(solution))
+    assert meets_demands(network)
+    assert network.get_cost() == pytest.approx(solution.attributes['cost'])
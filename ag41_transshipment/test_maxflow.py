@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_maxflow.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the maximum flow and minimum cost flow algorithms of the transshipment solver project"""
+
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.maxflow import dinic, edmonds_karp, repair_flow
+from ag41_transshipment.mincost import get_linearized_unit_costs, successive_shortest_paths
+from ag41_transshipment.solver import expand_network
+from ag41_transshipment.test_solver import meets_demands
+import numpy as np
+import pytest
+
+
+def get_network(seed=4):
+    """Returns the expanded network of a generated instance"""
+
+    return expand_network(generate_instance(3, 6, 15, seed=seed))
+
+
+@pytest.mark.parametrize('algorithm', [dinic, edmonds_karp, successive_shortest_paths])
+def test_maximum_flows_meet_all_demands(algorithm):
+    network = algorithm(get_network())
+
+    assert meets_demands(network)
+
+
+def test_maximum_flow_limited_by_capacities():
+    network = get_network()
+    # the edges reaching a client get a single unit of capacity each
+    client = network.get_clients()[0]
+    network.capacity[network.head == client] = 1
+    received = min(int(network.demand[client]), int((network.head == client).sum()))
+    assert received < network.demand[client]
+
+    for algorithm in (dinic, edmonds_karp, successive_shortest_paths):
+        flow = algorithm(network.copy()).flow
+        assert flow[network.head == client].sum() == received
+        assert flow[np.isin(network.head, network.get_clients())].sum() == \
+            network.demand[network.demand > 0].sum() - network.demand[client] + received
+
+
+def test_successive_shortest_paths_is_of_minimum_cost():
+    unit_costs = get_linearized_unit_costs(get_network())
+    min_cost = float(np.dot(successive_shortest_paths(get_network()).flow, unit_costs))
+
+    for algorithm in (dinic, edmonds_karp):
+        assert min_cost <= float(np.dot(algorithm(get_network()).flow, unit_costs)) + 1e-6
+
+
+def test_successive_shortest_paths_with_negative_costs():
+    network = get_network()
+    costs = get_linearized_unit_costs(network) - 5.
+    successive_shortest_paths(network, costs)
+
+    assert meets_demands(network)
+    # no cheaper flow with the same value: dinic gives an upper bound
+    assert np.dot(network.flow, costs) <= np.dot(dinic(get_network()).flow, costs) + 1e-6
+
+
+def test_repair_flow_after_demand_change():
+    network = dinic(get_network())
+    flow = network.flow.copy()
+    clients = network.get_clients()
+    depots = network.get_depots()
+    # a unit of demand moves from a client to another
+    network.demand[clients[0]] -= 1
+    network.demand[clients[1]] += 1
+
+    assert repair_flow(network)
+    assert meets_demands(network)
+    # only the flow around the change moves
+    assert (network.flow != flow).sum() < len(flow) / 2
+
+    network.demand[depots[0]] -= network.capacity.sum()
+    assert not repair_flow(network)
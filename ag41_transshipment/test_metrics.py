@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_metrics.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the instrumentation of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.app import Application
+from ag41_transshipment.metrics import Metrics, count, get_metrics, record_cost, reset_metrics, timer
+from ag41_transshipment.test_parser import PROBLEM
+import json
+import os
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+def test_metrics():
+    metrics = Metrics()
+    for _ in range(2):
+        with metrics.timer('phase'):
+            metrics.count('events')
+    metrics.count('events', 3)
+    metrics.record_cost(10.)
+    metrics.record_cost(8.)
+    content = metrics.to_dict()
+
+    assert content['timers']['phase']['calls'] == 2
+    assert 0 <= content['timers']['phase']['wall_time'] <= content['total_time']
+    assert content['counters'] == {'events': 5}
+    assert [point['cost'] for point in content['trajectory']] == [10., 8.]
+    assert content['trajectory'][0]['time'] <= content['trajectory'][1]['time']
+
+
+def test_timer_counts_interrupted_phases():
+    metrics = reset_metrics()
+    with pytest.raises(KeyboardInterrupt):
+        with timer('phase'):
+            raise KeyboardInterrupt
+    count('events')
+    record_cost(1.)
+
+    assert get_metrics() is metrics
+    assert metrics.timers['phase']['calls'] == 1
+    assert metrics.counters == {'events': 1} and len(metrics.trajectory) == 1
+
+
+@pytest.mark.parametrize('profile', [False, True])
+def test_export_metrics(tmp_path, profile):
+    file_name = str(tmp_path / 'small.txt')
+    with open(file_name, 'wb') as file:
+        file.write(PROBLEM)
+
+    Application(file_name, 1000, metrics=True, profile=profile)
+    with open(file_name + '.sol.metrics.json') as file:
+        content = json.load(file)
+
+    assert {'parse', 'expand', 'initial_flow', 'cycle_search', 'export'} <= set(content['timers'])
+    assert content['counters']['augmenting_paths'] > 0
+    assert content['trajectory']
+    assert os.path.exists(file_name + '.sol.metrics.prof') == profile
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_parser.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the parser of the transshipment solver project"""
+
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.parser import Parser, export_instance, import_solution, parse_lines
+import numpy as np
+import pytest
+
+# two depots, two platforms and two clients, edge 4 is in no chain within T and edge 9 has no capacity
+PROBLEM = b"""NAME : small
+NBR_NODES : 6
+NBR_EDGES : 9
+T : 20.000000
+NODE: 1 0.0 0.0 -4 0.000000 0.000000
+NODE: 2 0.0 1.0 -3 0.000000 0.000000
+NODE: 3 1.0 0.0 0 1.000000 2.000000
+NODE: 4 1.0 1.0 0 2.000000 1.000000
+NODE: 5 2.0 0.0 5 0.000000 0.000000
+NODE: 6 2.0 1.0 2 0.000000 0.000000
+EDGE: 1 1 3 10 5.0 1.0 5.0
+EDGE: 2 2 3 10 8.0 1.0 5.0
+EDGE: 3 2 4 10 3.0 2.0 5.0
+EDGE: 4 1 4 10 6.0 1.0 15.0
+EDGE: 5 3 5 10 4.0 1.0 5.0
+EDGE: 6 3 6 10 4.0 2.0 5.0
+EDGE: 7 4 5 10 2.0 1.0 5.0
+EDGE: 8 4 6 10 1.0 1.0 5.0
+EDGE: 9 1 3 0 1.0 1.0 1.0
+EOF
+"""
+
+
+def get_problem():
+    """Returns the instance of PROBLEM"""
+
+    return parse_lines(iter(PROBLEM.splitlines(True)), 'small')
+
+
+def test_parse_lines():
+    instance = get_problem()
+
+    assert instance.attributes == {'name': 'small', 'nbr_nodes': 6, 'nbr_edges': 9, 'time': 20.}
+    assert instance.node_ids.tolist() == [1, 2, 3, 4, 5, 6]
+    assert instance.demand.tolist() == [-4, -3, 0, 0, 5, 2]
+    # the edge without capacity is left out
+    assert instance.edge_ids.tolist() == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert instance.tail[3] == 1 and instance.head[3] == 4
+    assert instance.edge_time[3] == 15.
+
+
+def test_parse_lines_syntax_error():
+    with pytest.raises(SyntaxError):
+        parse_lines(iter([b'NAME : broken\n', b'UNKNOWN : 1\n']), 'broken')
+    with pytest.raises(SyntaxError):
+        parse_lines(iter([b'T : 20.0\n', b'NODE: 1 0.0 0.0\n', b'EOF\n']), 'broken')
+    with pytest.raises(SyntaxError, match='no time limit'):
+        parse_lines(iter(line for line in PROBLEM.splitlines(True) if not line.startswith(b'T ')), 'broken')
+
+
+@pytest.mark.parametrize('records, error', [
+    ({5: b'NODE: 2 0.0 1.0 -3 0.000000\n'}, '5 values instead of 6 in the NODE record at line 6'),
+    # an extra and a missing value would still make whole rows, each record is checked
+    ({5: b'NODE: 2 0.0 1.0 -3 0.000000 0.000000 0.0\n', 6: b'NODE: 3 1.0 0.0 0 1.000000\n'}, '7 values.*line 6'),
+    ({11: b'EDGE: 1 1 3 10 5.0 one 5.0\n'}, 'syntax error at line 12')])
+def test_parse_lines_record_errors(records, error):
+    lines = PROBLEM.splitlines(True)
+    for i, line in records.items():
+        lines[i] = line
+    with pytest.raises(SyntaxError, match=error):
+        parse_lines(iter(lines), 'broken')
+
+
+def test_export_instance_round_trip(tmp_path):
+    instance = generate_instance(2, 3, 6, seed=1)
+    file_name = str(tmp_path / 'generated.txt')
+    export_instance(instance, file_name)
+    parsed = Parser(file_name).import_instance()
+
+    assert parsed.node_ids.tolist() == instance.node_ids.tolist()
+    assert parsed.demand.tolist() == instance.demand.tolist()
+    assert parsed.edge_ids.tolist() == instance.edge_ids.tolist()
+    assert parsed.capacity.tolist() == instance.capacity.tolist()
+    assert np.allclose(parsed.fixed_cost, instance.fixed_cost)
+    assert np.allclose(parsed.edge_time, instance.edge_time)
+
+
+def test_content_hash(tmp_path):
+    first = tmp_path / 'first.txt'
+    second = tmp_path / 'second.txt'
+    first.write_bytes(PROBLEM)
+    second.write_bytes(PROBLEM)
+
+    assert Parser(str(first)).get_content_hash() == Parser(str(second)).get_content_hash()
+    second.write_bytes(PROBLEM.replace(b'T : 20.000000', b'T : 30.000000'))
+    assert Parser(str(first)).get_content_hash() != Parser(str(second)).get_content_hash()
+
+
+def test_import_solution_reads_the_best_solution(tmp_path):
+    solution = tmp_path / 'small.txt.sol'
+    solution.write_text('Edge #1 from node #1 to node #DP1-3 used with flow=4\n'
+                        'Result: 30.0\n'
+                        'Edge #1 from node #1 to node #DP1-3 used with flow=3\n'
+                        'Edge #2-3-5 from node #DP2-3 to node #CP5-3 used with flow=2\n'
+                        'Result: 20.0\n')
+
+    assert import_solution(str(solution)) == {('1', 'DP1-3'): 3, ('DP2-3', 'CP5-3'): 2}
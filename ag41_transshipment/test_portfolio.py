@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_portfolio.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the parallel portfolio search of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.metrics import get_metrics, reset_metrics
+from ag41_transshipment.portfolio import solve_portfolio
+from ag41_transshipment.solver import initialize, solve
+from ag41_transshipment.test_solver import meets_demands
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+def get_network(lower_bound=False):
+    """Returns the initialized network of a generated instance"""
+
+    return initialize(generate_instance(3, 5, 20, seed=4), lower_bound=lower_bound)
+
+
+def test_portfolio_keeps_the_best_flow():
+    reset_metrics()
+    network = get_network()
+    initial_cost = network.attributes['cost']
+    network = solve_portfolio(network, 500, 2)
+
+    assert network.attributes['cost'] <= initial_cost
+    assert network.attributes['cost'] == pytest.approx(network.get_cost())
+    assert meets_demands(network)
+    # the slope scalings run until the time limit, the counters of both workers are added
+    assert network.attributes['interrupted'] and not network.attributes['cancelled']
+    assert get_metrics().counters['slope_scaling_iterations'] >= 2
+
+
+def test_portfolio_with_a_cycle_search():
+    # the first worker runs the cycle search, the incumbent is at least as good as its solution
+    cost = solve(get_network(), 5000).attributes['cost']
+    network = solve_portfolio(get_network(), 500, 2, 'negative_cycle')
+
+    assert network.attributes['cost'] <= cost + 1e-6
+    assert meets_demands(network)
+
+
+def test_portfolio_target_gap():
+    network = solve_portfolio(get_network(lower_bound=True), 5000, 2, target_gap=1.)
+
+    assert network.attributes['gap_reached']
+    assert not network.attributes['interrupted']
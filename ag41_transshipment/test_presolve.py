@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_presolve.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the presolve of the transshipment solver project"""
+
+from ag41_transshipment import solver
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.mincost import get_linearized_unit_costs, successive_shortest_paths
+from ag41_transshipment.presolve import presolve_instance
+from ag41_transshipment.solver import expand_network, get_chains, initialize, solve
+from ag41_transshipment.test_parser import get_problem
+import numpy as np
+
+
+def test_presolve_removes_edges_in_no_chain():
+    instance, reductions = presolve_instance(get_problem())
+
+    # edge 4 is too slow for any chain
+    assert 4 not in instance.edge_ids.tolist()
+    assert reductions['unreachable_edges'] == 1
+    assert reductions['removed_platforms'] == 0
+    assert instance.attributes['nbr_edges'] == len(instance.edge_ids)
+
+
+def test_presolve_tightens_capacities():
+    instance, reductions = presolve_instance(get_problem())
+    capacity = dict(zip(instance.edge_ids.tolist(), instance.capacity.tolist()))
+
+    # no edge carries more than the supply of its depot or the demand of its client
+    assert capacity[1] == 4 and capacity[2] == 3 and capacity[3] == 3
+    assert capacity[5] == 5 and capacity[6] == 2 and capacity[7] == 3 and capacity[8] == 2
+    assert reductions['tightened_edges'] == 7
+
+
+def test_presolve_keeps_the_chains():
+    instance = generate_instance(3, 8, 25, seed=5, density=0.9)
+    presolved, reductions = presolve_instance(instance)
+
+    def get_chain_ids(instance):
+        tail, head, dp, cp, first, second = get_chains(instance)
+        ids = instance.node_ids
+        return set(zip(ids[tail[dp[first]]].tolist(), ids[head[dp[first]]].tolist(),
+                       ids[head[cp[second]]].tolist()))
+
+    assert get_chain_ids(presolved) <= get_chain_ids(instance)
+    assert reductions['unreachable_edges'] + reductions['dominated_edges'] == \
+        len(instance.edge_ids) - len(presolved.edge_ids)
+
+
+def test_presolve_keeps_feasibility_and_bound_order():
+    instance = generate_instance(3, 8, 25, seed=5, density=0.9)
+    presolved, reductions = presolve_instance(instance)
+
+    solution = initialize(presolved)
+    assert solver.test_feasibility(solution)
+    solution = solve(solution, 2000)
+
+    # tighter capacities spread the fixed costs over fewer units, so the bound can only rise
+    bounds = []
+    for problem in (instance, presolved):
+        network = successive_shortest_paths(expand_network(problem))
+        bounds.append(float(np.dot(network.flow, get_linearized_unit_costs(network))))
+    assert bounds[0] <= bounds[1] + 1e-6
+    assert bounds[1] <= solution.attributes['cost'] + 1e-6
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_residual.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the residual graph of the transshipment solver project"""
+
+from ag41_transshipment.maxflow import dinic
+from ag41_transshipment.residual import ResidualGraph
+from ag41_transshipment.solver import expand_network
+from ag41_transshipment.test_parser import get_problem
+import pytest
+
+
+def get_residual():
+    """Returns the residual graph of a maximum flow of the problem of test_parser, and the arcs of a cycle
+    moving one unit of client 5 from platform 3 to platform 4"""
+
+    network = dinic(expand_network(get_problem()))
+    labels = network.labels
+    edges = dict(((labels[u], labels[v]), e) for e, (u, v) in enumerate(zip(network.tail.tolist(),
+                                                                            network.head.tolist())))
+    cycle = [2 * edges[(2, 'DP2-4')], 2 * edges[('DP2-4', 'CP5-4')], 2 * edges[('CP5-4', 5)],
+             2 * edges[('CP5-3', 5)] + 1, 2 * edges[('DP2-3', 'CP5-3')] + 1, 2 * edges[(2, 'DP2-3')] + 1]
+
+    return ResidualGraph(network), cycle
+
+
+def get_reverse(cycle):
+    """Returns the arcs of a cycle taken backward"""
+
+    return [arc ^ 1 for arc in reversed(cycle)]
+
+
+def test_push_updates_flow_and_cost():
+    residual, cycle = get_residual()
+    flow = residual.network.flow.copy()
+    cost = residual.cost
+
+    # the maximum flow sends a single unit from depot 2 to client 5
+    assert residual.get_cycle_capacity(cycle) == 1
+    delta = residual.push(cycle, 1)
+
+    assert residual.cost == pytest.approx(cost + delta)
+    assert residual.cost == pytest.approx(residual.network.get_cost())
+    assert (residual.network.flow != flow).sum() == len(cycle)
+
+
+def test_undo_restores_flow_and_cost():
+    residual, cycle = get_residual()
+    flow = residual.network.flow.copy()
+    cost = residual.cost
+
+    residual.push(cycle, 1)
+    residual.push(get_reverse(cycle), 1)
+    residual.push(cycle, 1)
+    residual.undo()
+
+    assert residual.network.flow.tolist() == flow.tolist()
+    assert residual.cost == pytest.approx(cost)
+    assert residual.log == []
+
+
+def test_undo_stops_at_commit():
+    residual, cycle = get_residual()
+
+    residual.push(cycle, 1)
+    residual.commit()
+    flow = residual.network.flow.copy()
+    cost = residual.cost
+    residual.push(get_reverse(cycle), 1)
+    residual.undo()
+
+    assert residual.network.flow.tolist() == flow.tolist()
+    assert residual.cost == pytest.approx(cost)
+
+
+def test_reset_after_direct_changes():
+    residual, cycle = get_residual()
+
+    residual.push(cycle, 1)
+    residual.network.flow[:] = 0
+    residual.reset()
+
+    assert residual.cost == 0
+    assert residual.log == []
+    residual.undo()
+    assert residual.cost == 0
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_result_cache.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the result cache of the transshipment solver project"""
+
+from ag41_transshipment.result_cache import ResultCache, relocate_solution
+import json
+import os
+import time
+
+CONFIGURATION = {'method': 'negative_cycle', 'initial_flow': 'dinic', 'max_time': 1000}
+
+
+def test_store_and_load(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.get_key('hash', CONFIGURATION)
+    entry = {'problem': 'a.txt', 'summary': {'best_cost': 42.}, 'solution': 'Result: 42.0\n'}
+
+    assert cache.load(key) is None
+    cache.store(key, entry)
+    assert cache.load(key) == entry
+    assert os.listdir(str(tmp_path)) == [key + '.json']
+
+
+def test_key_depends_on_content_and_configuration(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.get_key('hash', CONFIGURATION)
+
+    assert cache.get_key('hash', dict(CONFIGURATION)) == key
+    assert cache.get_key('other hash', CONFIGURATION) != key
+    assert cache.get_key('hash', dict(CONFIGURATION, max_time=2000)) != key
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path), size=2)
+    keys = [cache.get_key(str(i), CONFIGURATION) for i in range(3)]
+    cache.store(keys[0], {'index': 0})
+    cache.store(keys[1], {'index': 1})
+    # the first result is the oldest, until it is read
+    past = time.time() - 10
+    os.utime(cache.get_path(keys[1]), (past, past))
+    os.utime(cache.get_path(keys[0]), (past - 10, past - 10))
+    cache.load(keys[0])
+    cache.store(keys[2], {'index': 2})
+
+    assert cache.load(keys[0]) == {'index': 0}
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[2]) == {'index': 2}
+
+
+def test_load_ignores_broken_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = cache.get_key('hash', CONFIGURATION)
+    with open(cache.get_path(key), 'w') as file:
+        file.write('{"summary": ')
+
+    assert cache.load(key) is None
+
+
+def test_relocate_solution():
+    text = 'Problem file: old/a.txt\nSolution file: old/a.txt.sol\nResult: 42.0\n'
+    assert relocate_solution(text, 'old/a.txt', 'new/a.txt') == \
+        'Problem file: new/a.txt\nSolution file: new/a.txt.sol\nResult: 42.0\n'
+
+    lines = json.dumps({'problem': 'old/a.txt', 'cost': 42.}) + '\n' + json.dumps({'id': 1, 'flow': 2}) + '\n'
+    relocated = relocate_solution(lines, 'old/a.txt', 'new/a.txt').split('\n')
+    assert json.loads(relocated[0]) == {'problem': 'new/a.txt', 'cost': 42.}
+    assert json.loads(relocated[1]) == {'id': 1, 'flow': 2}
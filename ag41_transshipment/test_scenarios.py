@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_scenarios.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the demand scenarios of the transshipment solver project"""
+
+from ag41_transshipment import output
+from ag41_transshipment.parser import import_scenarios
+from ag41_transshipment.scenarios import get_scenario_demand, solve_scenarios
+from ag41_transshipment.solver import expand_network
+from ag41_transshipment.test_parser import PROBLEM, get_problem
+import pytest
+
+# the clients swap their demands, then one of them gets some of it from the other one
+SCENARIOS = """scenario,5,6
+swapped,2,5
+shifted,4,3
+"""
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    verbosity = output.VERBOSITY
+    output.set_verbosity(output.QUIET)
+    yield
+    output.set_verbosity(verbosity)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_solve_scenarios(tmp_path, workers):
+    problem = tmp_path / 'small.txt'
+    problem.write_bytes(PROBLEM)
+    scenarios_file = tmp_path / 'scenarios.csv'
+    scenarios_file.write_text(SCENARIOS)
+
+    results = solve_scenarios(str(problem), import_scenarios(str(scenarios_file)), 1000, workers=workers)
+
+    assert [result['scenario'] for result in results] == ['swapped', 'shifted']
+    for result, (client_5, client_6) in zip(results, [(2, 5), (4, 3)]):
+        assert result['feasible']
+        delivered = dict((client, sum(edge['flow'] for edge in result['flows'] if edge['to'] == client))
+                         for client in (5, 6))
+        assert delivered == {5: client_5, 6: client_6}
+    if workers == 1:
+        # the second scenario starts from the solution of the first one
+        assert results[1]['warm_start'] == 'swapped'
+
+
+@pytest.mark.parametrize('scenario', [{7: 1}, {5: -5, 6: 12}, {5: 6}])
+def test_invalid_scenarios(scenario):
+    # unknown node, changed role and demands not summing to 0
+    with pytest.raises(ValueError):
+        get_scenario_demand(expand_network(get_problem()), 'invalid', scenario)
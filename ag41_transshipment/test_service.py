@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_service.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the solver service of the transshipment solver project"""
+
+from ag41_transshipment.service import ServiceHandler, SolverService
+from ag41_transshipment.test_parser import PROBLEM
+from ag41_transshipment.test_solver import PROBLEM_OPTIMUM
+from http.server import ThreadingHTTPServer
+import json
+import pytest
+import threading
+import urllib.error
+import urllib.request
+
+
+@pytest.fixture(scope='module')
+def service():
+    service = SolverService()
+    yield service
+    service.shutdown()
+
+
+def test_solve_inline_instance(service):
+    result = service.solve({'instance': PROBLEM.decode(), 'max_time': 2000, 'bound': True})
+
+    assert result['feasible']
+    assert result['problem'] == '<inline>'
+    assert result['cost'] <= result['initial_cost']
+    assert result['lower_bound'] <= PROBLEM_OPTIMUM <= result['cost']
+    assert sum(edge['flow'] for edge in result['flows'] if edge['to'] in (5, 6)) == 7
+
+
+def test_networks_are_cached(service, tmp_path):
+    problem = tmp_path / 'small.txt'
+    problem.write_bytes(PROBLEM)
+    hits = service.get_status()['cache_hits']
+
+    service.solve({'file': str(problem), 'max_time': 500})
+    result = service.solve({'instance': PROBLEM.decode(), 'max_time': 500})
+
+    assert result['cached']
+    assert service.get_status()['cache_hits'] >= hits + 1
+
+
+@pytest.mark.parametrize('fields', [{}, {'file': '/nonexistent/problem.txt'},
+                                    {'instance': PROBLEM.decode(), 'method': 'unknown'},
+                                    {'instance': PROBLEM.decode(), 'initial_flow': 'unknown'},
+                                    {'instance': PROBLEM.decode(), 'gap': 'abc'},
+                                    {'instance': PROBLEM.decode(), 'gap': -0.1},
+                                    {'instance': PROBLEM.decode(), 'gap': [0.1]},
+                                    {'instance': PROBLEM.decode(), 'max_time': None},
+                                    {'instance': PROBLEM.decode(), 'max_time': 'abc'},
+                                    {'instance': PROBLEM.decode(), 'max_time': -1},
+                                    {'instance': PROBLEM.decode(), 'seed': None},
+                                    {'instance': PROBLEM.decode(), 'seed': -1}])
+def test_invalid_requests(service, fields):
+    status = service.get_status()
+    with pytest.raises(ValueError):
+        service.solve(fields)
+
+    assert service.get_status() == status
+
+
+def test_instance_without_time_limit(service):
+    status = service.get_status()
+    instance = b''.join(line for line in PROBLEM.splitlines(True) if not line.startswith(b'T '))
+    with pytest.raises(SyntaxError):
+        service.solve({'instance': instance.decode()})
+
+    # a failed request counts neither as a hit nor as a miss of the cache
+    assert service.get_status() == status
+
+
+def post(url, body):
+    """Sends a POST request, returns the status and the JSON content of the response"""
+
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, body, method='POST')) as response:
+            return response.status, json.loads(response.read().decode())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read().decode())
+
+
+def test_http_errors(service, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ServiceHandler)
+    server.service = service
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = 'http://127.0.0.1:{}/solve'.format(server.server_address[1])
+    try:
+        status, content = post(url, json.dumps({'instance': PROBLEM.decode(), 'max_time': None}).encode())
+        assert status == 400 and 'max_time' in content['error']
+        assert post(url, b'{not json')[0] == 400
+
+        def fail(request):
+            raise RuntimeError('worker lost')
+
+        monkeypatch.setattr(service, 'solve', fail)
+        status, content = post(url, json.dumps({'instance': PROBLEM.decode()}).encode())
+        assert status == 500 and 'worker lost' in content['error']
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_gap_request(service):
+    result = service.solve({'instance': PROBLEM.decode(), 'max_time': 2000, 'gap': '0.5'})
+
+    assert result['lower_bound'] is not None
+    assert result['gap'] <= 0.5 or result['interrupted']
@@ -0,0 +1,157 @@
+#!/usr/bin/python3
+# -*- coding: utf8 -*-
+
+# File: test_solver.py
+#
+# By Maxime Brodat <maxime.brodat@fouss.fr>
+#
+# Created: 18/10/2026 by Fouss
+
+"""Tests of the expansion, the lower bound and the searches of the transshipment solver project"""
+
+from ag41_transshipment import solver
+from ag41_transshipment.deadline import DeadlineReached, clear_deadline, set_deadline
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.parser import parse_lines
+from ag41_transshipment.residual import ResidualGraph
+from ag41_transshipment.test_parser import get_problem
+import numpy as np
+import pytest
+import time
+
+# edges 1 and 2 are parallel, and so are edges 3 and 4, the optimal solution uses all but edge 4
+PARALLEL = b"""NAME : parallel
+NBR_NODES : 3
+NBR_EDGES : 4
+T : 100.000000
+NODE: 1 0.0 0.0 -3 0.000000 0.000000
+NODE: 2 0.5 0.5 0 1.000000 1.000000
+NODE: 3 1.0 1.0 3 0.000000 0.000000
+EDGE: 1 1 2 2 10.0 1.0 5.0
+EDGE: 2 1 2 2 12.0 2.0 5.0
+EDGE: 3 2 3 5 10.0 1.0 5.0
+EDGE: 4 2 3 5 20.0 1.0 5.0
+EOF
+"""
+
+# best solution of the problem of test_parser: depot 2 supplies platform 4, which serves client 6 and
+# one unit of client 5
+PROBLEM_OPTIMUM = 42.
+
+
+def get_chain_labels(network):
+    """Returns the pairs of labels of the chain edges of an expanded network"""
+
+    return sorted((network.labels[u], network.labels[v]) for u, v in zip(network.tail.tolist(), network.head.tolist())
+                  if str(network.labels[u]).startswith('DP') and str(network.labels[v]).startswith('CP'))
+
+
+def meets_demands(network):
+    """Tells whether the flow of a network meets all demands within the capacities"""
+
+    excess = (np.bincount(network.head, network.flow, network.nbr_nodes)
+              - np.bincount(network.tail, network.flow, network.nbr_nodes))
+    return (network.flow >= 0).all() and (network.flow <= network.capacity).all() and \
+        np.allclose(excess, network.demand)
+
+
+def test_expand_network_keeps_chains_within_time_limit():
+    network = solver.expand_network(get_problem())
+
+    # the edge from depot 1 to platform 4 is too slow for any chain
+    assert get_chain_labels(network) == [('DP1-3', 'CP5-3'), ('DP1-3', 'CP6-3'), ('DP2-3', 'CP5-3'),
+                                         ('DP2-3', 'CP6-3'), ('DP2-4', 'CP5-4'), ('DP2-4', 'CP6-4')]
+    chain = network.labels.index('DP2-4'), network.labels.index('CP5-4')
+    e = [(u, v) for u, v in zip(network.tail.tolist(), network.head.tolist())].index(chain)
+    # a chain costs the unit cost of its platform, and can carry what both of its edges can
+    assert network.unit_cost[e] == 2. and network.fixed_cost[e] == 0. and network.capacity[e] == 10
+
+
+def test_expand_network_with_parallel_edges():
+    network = solver.expand_network(parse_lines(iter(PARALLEL.splitlines(True)), 'parallel'))
+
+    assert len(set(network.labels)) == len(network.labels)
+    assert get_chain_labels(network) == [('DP1-2-1', 'CP3-2-3'), ('DP1-2-1', 'CP3-2-4'), ('DP1-2-2', 'CP3-2-3'),
+                                         ('DP1-2-2', 'CP3-2-4')]
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_solve_with_parallel_edges(lazy):
+    network = solver.initialize(parse_lines(iter(PARALLEL.splitlines(True)), 'parallel'), lazy=lazy)
+    assert solver.test_feasibility(network)
+    network = solver.solve(network, 5000)
+
+    assert network.attributes['cost'] == pytest.approx(42.)
+
+
+def test_lower_bound():
+    network = solver.expand_network(get_problem())
+    solver.initialize_network(network, 'dinic', lower_bound=True)
+
+    assert network.attributes['lower_bound'] <= PROBLEM_OPTIMUM
+    assert meets_demands(network)
+
+
+def test_lower_bound_after_min_cost_fallback(monkeypatch):
+    instance = generate_instance(3, 5, 20, seed=2)
+    network = solver.expand_network(instance)
+    solver.initialize_network(network, 'min_cost', lower_bound=True)
+    lower_bound = network.attributes['lower_bound']
+
+    # the min_cost initial flow is cut by the deadline, the Dinic flow replacing it isn't of minimum cost
+    successive_shortest_paths = solver.successive_shortest_paths
+    calls = []
+
+    def cut_first_call(network):
+        calls.append(network)
+        if len(calls) == 1:
+            raise DeadlineReached
+        return successive_shortest_paths(network)
+
+    monkeypatch.setattr(solver, 'successive_shortest_paths', cut_first_call)
+    network = solver.expand_network(instance)
+    solver.initialize_network(network, 'min_cost', lower_bound=True)
+
+    assert len(calls) == 2
+    assert network.attributes['lower_bound'] == pytest.approx(lower_bound)
+    assert network.attributes['lower_bound'] <= network.attributes['cost']
+
+
+def test_initial_flow_cut_by_deadline():
+    network = solver.expand_network(get_problem())
+    set_deadline(0)
+    try:
+        solver.initialize_network(network)
+    finally:
+        clear_deadline()
+
+    # without a maximum flow there is no solution yet, which doesn't mean there is none
+    assert network.attributes['interrupted']
+    assert not solver.test_feasibility(network)
+
+
+@pytest.mark.parametrize('method', sorted(solver.CYCLE_SEARCHES))
+def test_cycle_searches_improve_the_flow(method):
+    network = solver.expand_network(generate_instance(2, 4, 8, seed=3))
+    solver.dinic(network)
+    residual = ResidualGraph(network)
+    initial_cost = residual.cost
+
+    u_time = time.time()
+    while solver.CYCLE_SEARCHES[method](residual, u_time, 10000):
+        residual.commit()
+
+    assert residual.cost < initial_cost
+    assert residual.cost == pytest.approx(network.get_cost())
+    assert meets_demands(network)
+
+
+@pytest.mark.parametrize('method', sorted(solver.METAHEURISTICS))
+def test_metaheuristics_keep_the_best_flow(method):
+    network = solver.initialize(generate_instance(2, 4, 8, seed=3))
+    initial_cost = network.attributes['cost']
+    network = solver.solve(network, 300, method)
+
+    assert network.attributes['cost'] <= initial_cost
+    assert network.attributes['cost'] == pytest.approx(network.get_cost())
+    assert meets_demands(network)
@@ -9,7 +9,16 @@
 
 """Running file for the transshipment solver project"""
 
-from ag41_transshipment.app import Application
+from ag41_transshipment.app import solve_all, solve_file
+from ag41_transshipment.benchmark import BENCHMARK_FIELDS, SIZE_LADDER, run_benchmark
+from ag41_transshipment.generator import generate_instance
+from ag41_transshipment.output import FULL, display, set_verbosity
+from ag41_transshipment.parser import SCENARIO_FIELDS, export_instance, export_scenario_flows, export_summary, \
+    get_problem_files, import_scenarios
+from ag41_transshipment.result_cache import RESULT_CACHE_DIR, RESULT_CACHE_SIZE, ResultCache
+from ag41_transshipment.scenarios import solve_scenarios
+from ag41_transshipment.service import CACHE_SIZE, SERVICE_PORT, run_service
+from ag41_transshipment.solver import CYCLE_SEARCHES, INITIAL_FLOWS, METAHEURISTICS
 import sys
 import os
 
@@ -18,41 +27,249 @@ def print_help(func_arg):
     """Displays the help of the program"""
 
     print('How to use:', file=sys.stderr)
-    print('\t{} solve [data_file_name] [max_time]'.format(func_arg), file=sys.stderr)
+    print('\t{} solve [data_file_name] [max_time] ([method] [initial_flow])'.format(func_arg), file=sys.stderr)
     print('\t\tto solve the problem in the file [data_file_name] in maximum [max_time] milliseconds', file=sys.stderr)
-    print('\t{} solve-all [data_directory] [max_time]'.format(func_arg), file=sys.stderr)
-    print('\t\tto solve all problems in the folder [data_directory] in maximum [max_time] milliseconds', file=sys.stderr)
+    print('\t\t--workers=[n] runs a portfolio of [n] differently seeded searches in parallel, or solves the',
+          file=sys.stderr)
+    print('\t\tindependent parts of the network on [n] processes when it splits (default: 1)', file=sys.stderr)
+    print('\t{} solve-all [data_directory] [max_time] ([method] [initial_flow])'.format(func_arg), file=sys.stderr)
+    print('\t\tto solve all problems in the folder [data_directory] in maximum [max_time] milliseconds each', file=sys.stderr)
+    print('\t\t--workers=[n] solves [n] problems at the same time (default: 1)', file=sys.stderr)
+    print('\t\t--summary=[file] writes the summary of all resolutions in [file], as CSV if it ends with .csv',
+          file=sys.stderr)
+    print('\t\t(default: [data_directory]/summary.sol.json)', file=sys.stderr)
+    print('\t{} scenarios [data_file_name] [scenario_file] [max_time] ([method] [initial_flow])'.format(func_arg),
+          file=sys.stderr)
+    print('\t\tto solve the problem in the file [data_file_name] under each demand scenario of [scenario_file] in',
+          file=sys.stderr)
+    print('\t\tmaximum [max_time] milliseconds each, expanding the problem only once. [scenario_file] is a CSV',
+          file=sys.stderr)
+    print('\t\tfile with a header "scenario,[node id],..." and a row of demands for each scenario. The costs are',
+          file=sys.stderr)
+    print('\t\twritten in [data_file_name].sol.scenarios.json (or --summary=[file]), the used edges in',
+          file=sys.stderr)
+    print('\t\t[data_file_name].sol.scenarios.jsonl', file=sys.stderr)
+    print('\t\t--workers=[n] solves [n] scenarios at the same time, else each one starts from the solution of the',
+          file=sys.stderr)
+    print('\t\tclosest scenario already solved (default: 1)', file=sys.stderr)
+    print('\t{} benchmark [data_directory] [max_time] ([method] [initial_flow])'.format(func_arg), file=sys.stderr)
+    print('\t\tto generate an instance of each size of a ladder in the folder [data_directory] and solve it in',
+          file=sys.stderr)
+    print('\t\tmaximum [max_time] milliseconds, reporting the times to the first and best solutions, the costs and',
+          file=sys.stderr)
+    print('\t\tthe peak memory of each run', file=sys.stderr)
+    print('\t\t--sizes=[n] only uses the [n] smallest sizes (default: {})'.format(len(SIZE_LADDER)),
+          file=sys.stderr)
+    print('\t\t--results=[file] writes the results in [file], as CSV if it ends with .csv', file=sys.stderr)
+    print('\t\t(default: [data_directory]/benchmark.sol.json)', file=sys.stderr)
+    print('\t{} generate [data_file_name] [depots] [platforms] [clients]'.format(func_arg), file=sys.stderr)
+    print('\t\tto write a random instance in the file [data_file_name]', file=sys.stderr)
+    print('\t{} serve [port]'.format(func_arg), file=sys.stderr)
+    print('\t\tto serve solve requests on http://127.0.0.1:[port] (default: {}) until interrupted:'.format(
+        SERVICE_PORT), file=sys.stderr)
+    print('\t\tPOST /solve with a JSON object giving "file" (a problem file) or "instance" (its content) and',
+          file=sys.stderr)
+    print('\t\toptionally "max_time", "method", "initial_flow", "seed", "bound" and "gap", GET /status',
+          file=sys.stderr)
+    print('\t\t--workers=[n] solves [n] requests at the same time (default: 1)', file=sys.stderr)
+    print('\t\t--cache-size=[n] keeps the expanded networks of the [n] last problems (default: {})'.format(
+        CACHE_SIZE), file=sys.stderr)
     print('\t{} clean [data_directory]'.format(func_arg), file=sys.stderr)
-    print('\t\tto clean the folder [data_directory] of all .sol files', file=sys.stderr)
+    print('\t\tto clean the folder [data_directory] of all .sol files and .npz caches', file=sys.stderr)
+    print('With solve and solve-all:', file=sys.stderr)
+    print('\t[method] is the cycle search or metaheuristic used: {} (default: negative_cycle)'.format(
+        ', '.join(sorted(list(CYCLE_SEARCHES) + list(METAHEURISTICS)))), file=sys.stderr)
+    print('\t[initial_flow] is the initial solution used: {} (default: dinic)'.format(
+        ', '.join(sorted(INITIAL_FLOWS))), file=sys.stderr)
+    print('\t--cache keeps a binary copy of each problem next to its file ([data_file_name].npz) to load it faster',
+          file=sys.stderr)
+    print('\t--verbosity=[level] is 0 (nothing), 1 (costs and times only) or 2 (full solutions, default)',
+          file=sys.stderr)
+    print('\t--format=[format] is the solution file format: text ([data_file_name].sol, default) or jsonl',
+          file=sys.stderr)
+    print('\t\t([data_file_name].sol.jsonl, a line of results then a line for each used edge)', file=sys.stderr)
+    print('\t--metrics writes the phase timers, counters and cost trajectory in [data_file_name].sol.metrics.json',
+          file=sys.stderr)
+    print('\t--profile also writes the cProfile statistics in [data_file_name].sol.metrics.prof', file=sys.stderr)
+    print('\t--bound computes a lower bound of the cost (linear relaxation) to report the gap of the solutions',
+          file=sys.stderr)
+    print('\t--gap=[g] ends the optimization once the relative gap to the lower bound is at most [g] (as 0.01)',
+          file=sys.stderr)
+    print('\t--warm starts from the last solution of each problem ([data_file_name].sol, or .sol.jsonl with',
+          file=sys.stderr)
+    print('\t\t--format=jsonl), repaired where the problem changed, --warm=[file] from the solution in [file]',
+          file=sys.stderr)
+    print('\t--checkpoint saves the best solution every minute ([data_file_name].sol.ckpt.npz) until the end of',
+          file=sys.stderr)
+    print('\t\tthe resolution, --checkpoint=[s] every [s] seconds', file=sys.stderr)
+    print('\t--resume goes on from the checkpoint of a resolution that didn\'t end, with the rest of [max_time]',
+          file=sys.stderr)
+    print('\t--presolve removes the edges in no chain within the time limit and the dominated parallel edges,',
+          file=sys.stderr)
+    print('\t\tand tightens the capacities to the most flow each edge can carry, before the expansion',
+          file=sys.stderr)
+    print('\t--lazy replaces the edges of all chains from a depot to a client through a platform by a ladder',
+          file=sys.stderr)
+    print('\t\tof nodes for each platform, only the chains carrying flow are created in the solution',
+          file=sys.stderr)
+    print('\t--result-cache reuses the solution of a problem with the same content already solved with the same',
+          file=sys.stderr)
+    print('\t\tmethod, initial flow, [max_time] and options, kept in {}, --result-cache=[dir] in [dir]'.format(
+        RESULT_CACHE_DIR), file=sys.stderr)
+    print('\t\t(not with --warm, --checkpoint, --resume, --metrics or --profile)', file=sys.stderr)
+    print('\t--result-cache-size=[n] keeps the [n] last used results (default: {})'.format(RESULT_CACHE_SIZE),
+          file=sys.stderr)
+    print('\t--force solves the problems again and replaces their results in the result cache', file=sys.stderr)
+    print('With benchmark and generate:', file=sys.stderr)
+    print('\t--seed=[n] is the seed of the random instances (default: 0)', file=sys.stderr)
+    print('\t--tightness=[r] is the ratio of the depot and client capacities to the demand (default: 1.5)',
+          file=sys.stderr)
+    print('\t--cost-ratio=[r] is the ratio of fixed costs to flow costs of the edges (default: 10)', file=sys.stderr)
+    print('\t--time-limit=[t] is the maximum time from a depot to a client (default: 100)', file=sys.stderr)
+    print('\t--density=[p] is the probability of an edge between a platform and a depot or client (default: 0.7)',
+          file=sys.stderr)
 
 
-if len(sys.argv) == 4:
-    if sys.argv[1] == 'solve':
-        APP = Application(sys.argv[2], int(sys.argv[3]))
+def parse_options(args):
+    """Separates the --name=value and --name options from the other arguments"""
+
+    arguments = []
+    options = dict()
+    for arg in args:
+        if arg.startswith('--') and '=' in arg:
+            name, value = arg[2:].split('=', 1)
+            options[name] = value
+        elif arg.startswith('--'):
+            options[arg[2:]] = True
+        else:
+            arguments.append(arg)
+
+    return arguments, options
+
+
+def get_solve_options(options):
+    """Returns the options of the resolutions given on the command line"""
+
+    checkpoint = options.get('checkpoint')
+    return {
+        'cache': 'cache' in options,
+        'solution_format': options.get('format', 'text'),
+        'metrics': 'metrics' in options,
+        'profile': 'profile' in options,
+        'lower_bound': 'bound' in options,
+        'target_gap': float(options['gap']) if 'gap' in options else None,
+        'warm_start': options.get('warm'),
+        'checkpoint': float(checkpoint) if isinstance(checkpoint, str) else checkpoint,
+        'resume': 'resume' in options,
+        'presolve': 'presolve' in options,
+        'lazy': 'lazy' in options,
+        'result_cache': get_result_cache(options),
+        'force': 'force' in options
+    }
+
+
+def get_result_cache(options):
+    """Returns the result cache given on the command line, None without --result-cache"""
+
+    if 'result-cache' not in options:
+        return None
+
+    directory = options['result-cache']
+    return ResultCache(directory if isinstance(directory, str) else RESULT_CACHE_DIR,
+                       int(options.get('result-cache-size', RESULT_CACHE_SIZE)))
+
+
+def get_generator_options(options):
+    """Returns the options of the instance generator given on the command line"""
+
+    generator_options = dict()
+    for name in ('tightness', 'cost-ratio', 'time-limit', 'density'):
+        if name in options:
+            generator_options[name.replace('-', '_')] = float(options[name])
+
+    return generator_options
+
+
+def main(argv):
+    """Runs the command given in the arguments"""
+
+    args, options = parse_options(argv)
+    set_verbosity(int(options.get('verbosity', FULL)))
+    solution_format = options.get('format', 'text')
+
+    if len(args) == 6 and args[1] == 'generate':
+        instance = generate_instance(int(args[3]), int(args[4]), int(args[5]), int(options.get('seed', 0)),
+                                     **get_generator_options(options))
+        export_instance(instance, args[2])
+        display('Instance written in {}'.format(args[2]))
+
+    elif len(args) in (5, 6, 7) and args[1] == 'scenarios':
+        method = args[5] if len(args) >= 6 else 'negative_cycle'
+        initial_flow = args[6] if len(args) == 7 else 'dinic'
+        if (method not in CYCLE_SEARCHES and method not in METAHEURISTICS) or initial_flow not in INITIAL_FLOWS:
+            print_help(args[0])
+        else:
+            results = solve_scenarios(args[2], import_scenarios(args[3]), int(args[4]), method, initial_flow,
+                                      int(options.get('workers', 1)), 'bound' in options)
+            summary_path = options.get('summary', args[2] + '.sol.scenarios.json')
+            export_summary([dict((field, result[field]) for field in SCENARIO_FIELDS) for result in results],
+                           summary_path, SCENARIO_FIELDS)
+            export_scenario_flows(results, args[2] + '.sol.scenarios.jsonl')
+            display('Costs written in {}'.format(summary_path))
+
+    elif len(args) in (4, 5, 6):
+        method = args[4] if len(args) >= 5 else 'negative_cycle'
+        initial_flow = args[5] if len(args) == 6 else 'dinic'
+
+        if (method not in CYCLE_SEARCHES and method not in METAHEURISTICS) or initial_flow not in INITIAL_FLOWS \
+                or solution_format not in ('text', 'jsonl'):
+            print_help(args[0])
+
+        elif args[1] == 'solve':
+            solve_file(args[2], int(args[3]), method, initial_flow, workers=int(options.get('workers', 1)),
+                       **get_solve_options(options))
+
+        elif args[1] == 'solve-all':
+            summary_path = options.get('summary', args[2] + '/summary.sol.json')
+            file_names = get_problem_files(args[2], [summary_path])
+
+            summaries = solve_all(file_names, int(args[3]), method, initial_flow, int(options.get('workers', 1)),
+                                  **get_solve_options(options))
+            export_summary(summaries, summary_path)
+            display('Summary written in {}'.format(summary_path))
+
+        elif args[1] == 'benchmark':
+            sizes = SIZE_LADDER[:int(options.get('sizes', len(SIZE_LADDER)))]
+            results = run_benchmark(args[2], int(args[3]), method, initial_flow, sizes, int(options.get('seed', 0)),
+                                    **get_generator_options(options))
+            results_path = options.get('results', args[2] + '/benchmark.sol.json')
+            export_summary(results, results_path, BENCHMARK_FIELDS)
+            display('Results written in {}'.format(results_path))
+
+        else:
+            print_help(args[0])
+
+    elif len(args) in (2, 3) and args[1] == 'serve':
+        run_service(int(args[2]) if len(args) == 3 else SERVICE_PORT, int(options.get('workers', 1)),
+                    int(options.get('cache-size', CACHE_SIZE)))
+
+    elif len(args) == 3:
+        if args[1] == 'clean':
+            files = os.listdir(args[2])
+            nb_files = 0
+            for file in files:
+                parts = file.split('.')
+                if 'sol' in parts or parts[-1] == 'npz':
+                    os.remove(args[2] + '/' + file)
+                    nb_files += 1
+            print('All .sol files and .npz caches deleted!')
+            print('{} files removed'.format(nb_files))
+        else:
+            print_help(args[0])
 
-    elif sys.argv[1] == 'solve-all':
-        files = os.listdir(sys.argv[2])
-        files.sort()
-        for file in files:
-            parts = file.split('.')
-            if 'sol' not in parts:
-                APP = Application(sys.argv[2] + '/' + file, int(sys.argv[3]))
-    else:
-        print_help(sys.argv[0])
-
-elif len(sys.argv) == 3:
-    if sys.argv[1] == 'clean':
-        files = os.listdir(sys.argv[2])
-        nb_files = 0
-        for file in files:
-            parts = file.split('.')
-            if 'sol' in parts:
-                os.remove(sys.argv[2] + '/' + file)
-                nb_files += 1
-        print('All .sol files deleted!')
-        print('{} files removed'.format(nb_files))
     else:
-        print_help(sys.argv[0])
+        print_help(args[0])
+
 
-else:
-    print_help(sys.argv[0])
+if __name__ == '__main__':
+    main(sys.argv)